@@ -0,0 +1,76 @@
+import hashlib
+from pathlib import Path
+
+from app.config import neo4j_database
+
+
+def source_digest(source: bytes) -> str:
+    """Digest of a whole source file, stored as ``source_hash`` on its
+    class nodes so later reads can tell the file has changed."""
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+def read_class_source(repo_path: str | None, module_path: str | None,
+                      file_path: str | None, start: int | None,
+                      end: int | None, file_hash: str | None = None) -> str:
+    """Re-read a class's source slice from disk.
+
+    Class nodes store only ``source_start``/``source_end`` byte offsets
+    into ``file_path`` (relative to the module directory) instead of the
+    full source text. Returns "" if the file is no longer available, or
+    if it no longer matches ``file_hash`` (edited or checked out since the
+    analysis, so the offsets would slice the wrong code). Nodes analyzed
+    before the hash was stored have none and are sliced unchecked.
+    """
+    if not repo_path or not file_path or start is None or end is None:
+        return ""
+    full = Path(repo_path) / (module_path or "") / file_path
+    try:
+        with open(full, "rb") as f:
+            if file_hash:
+                data = f.read()
+                if source_digest(data) != file_hash:
+                    return ""
+                raw = data[start:end]
+            else:
+                f.seek(start)
+                raw = f.read(end - start)
+    except OSError:
+        return ""
+    return raw.decode("utf-8", errors="replace")
+
+
+def hydrate_class_sources(driver, nodes: list[dict]):
+    """Fill in ``source_code`` on Java:Class graph nodes for the UI.
+
+    Resolves repository/module paths for all classes in one query, then
+    reads each slice from disk.
+    """
+    class_ids = [
+        n["id"] for n in nodes
+        if "Class" in n["labels"] and "Java" in n["labels"]
+        and not n["properties"].get("source_code")
+    ]
+    if not class_ids:
+        return
+
+    with driver.session(database=neo4j_database()) as session:
+        result = session.run("""
+            MATCH (r:Java:Repository)-[:CONTAINS_MODULE]->(m:Java:Module)
+                  -[:CONTAINS_PACKAGE]->(:Java:Package)
+                  -[:CONTAINS_CLASS]->(c:Java:Class)
+            WHERE elementId(c) IN $ids
+            RETURN elementId(c) AS id, r.path AS repo_path,
+                   m.path AS module_path, c.source_hash AS source_hash
+        """, {"ids": class_ids})
+        paths = {r["id"]: (r["repo_path"], r["module_path"], r["source_hash"])
+                 for r in result}
+
+    for node in nodes:
+        if node["id"] not in paths:
+            continue
+        props = node["properties"]
+        repo_path, module_path, source_hash = paths[node["id"]]
+        props["source_code"] = read_class_source(
+            repo_path, module_path, props.get("file_path"),
+            props.get("source_start"), props.get("source_end"), source_hash)
@@ -1,5 +1,6 @@
 import re
 
+from app.analyzers.class_source import read_class_source
 from app.analyzers.enrichers.base import TechnologyEnricher, parse_json
 from app.neo4j_client import run_cypher_write
 
@@ -30,7 +31,8 @@ class SpringDataEnricher(TechnologyEnricher):
 
         with self.neo4j_session() as session:
             result = session.run("""
-                MATCH (:Java:Module {name: $module_name})
+                MATCH (r:Java:Repository)-[:CONTAINS_MODULE]->
+                      (mod:Java:Module {name: $module_name})
                       -[:CONTAINS_PACKAGE]->(:Java:Package)
                       -[:CONTAINS_CLASS]->(c:Java:Class)
                 WHERE c.kind = 'interface'
@@ -38,7 +40,12 @@ class SpringDataEnricher(TechnologyEnricher):
                 RETURN c.full_name AS full_name,
                        c.name AS name,
                        c.supertypes AS supertypes,
-                       c.source_code AS source_code
+                       r.path AS repo_path,
+                       mod.path AS module_path,
+                       c.file_path AS file_path,
+                       c.source_start AS source_start,
+                       c.source_end AS source_end,
+                       c.source_hash AS source_hash
             """, {"module_name": self.module_name})
 
             for record in result:
@@ -53,7 +60,10 @@ class SpringDataEnricher(TechnologyEnricher):
 
                 # Extract entity type from source code generics
                 entity_type = ""
-                source = record["source_code"] or ""
+                source = read_class_source(
+                    record["repo_path"], record["module_path"],
+                    record["file_path"], record["source_start"],
+                    record["source_end"], record["source_hash"])
                 match = _REPO_PATTERN.search(source)
                 if match:
                     entity_type = match.group(1)
@@ -1,5 +1,6 @@
 import re
 
+from app.analyzers.class_source import read_class_source
 from app.analyzers.enrichers.base import TechnologyEnricher, parse_json
 from app.neo4j_client import run_cypher_write
 
@@ -125,7 +126,8 @@ class SpringJmsEnricher(TechnologyEnricher):
                            destinations_seen: set[str]):
         with self.neo4j_session() as session:
             result = session.run("""
-                MATCH (:Java:Module {name: $module_name})
+                MATCH (r:Java:Repository)-[:CONTAINS_MODULE]->
+                      (mod:Java:Module {name: $module_name})
                       -[:CONTAINS_PACKAGE]->(:Java:Package)
                       -[:CONTAINS_CLASS]->(c:Java:Class)
                 WHERE $jms_template IN c.imports
@@ -133,7 +135,12 @@ class SpringJmsEnricher(TechnologyEnricher):
                           WHERE sp = $jms_pkg)
                 RETURN c.full_name AS full_name,
                        c.name AS name,
-                       c.source_code AS source_code
+                       r.path AS repo_path,
+                       mod.path AS module_path,
+                       c.file_path AS file_path,
+                       c.source_start AS source_start,
+                       c.source_end AS source_end,
+                       c.source_hash AS source_hash
             """, {
                 "module_name": self.module_name,
                 "jms_template": _JMS_TEMPLATE_FQN,
@@ -141,7 +148,10 @@ class SpringJmsEnricher(TechnologyEnricher):
             })
 
             for record in result:
-                source = record["source_code"] or ""
+                source = read_class_source(
+                    record["repo_path"], record["module_path"],
+                    record["file_path"], record["source_start"],
+                    record["source_end"], record["source_hash"])
                 destinations = set()
                 has_send_calls = False
 
@@ -1,12 +1,23 @@
 import json
+import multiprocessing
 import os
-from pathlib import Path
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
 from typing import Optional
 
 import tree_sitter_java as tsjava
-from tree_sitter import Language, Parser, Node
+from tree_sitter import Language, Node, Parser, Query, QueryCursor
 
 from app.analyzers.base import BaseAnalyzer
+from app.analyzers.class_source import source_digest
+from app.analyzers.technology_scanner import (
+    class_technologies, store_detected_technologies)
+from app.config import neo4j_database
 from app.neo4j_client import run_cypher_write
 
 JAVA_LANGUAGE = Language(tsjava.language())
@@ -18,11 +29,173 @@ _TYPE_DECLARATIONS = {
     "record_declaration": "record",
 }
 
-_MODIFIER_KEYWORDS = frozenset({
-    "public", "private", "protected", "static", "abstract",
-    "final", "synchronized", "native", "transient", "volatile",
-    "strictfp", "default", "sealed",
-})
+# Compiled tree-sitter queries, keyed by kind: matching runs the
+# subtree walk in C instead of recursing over node.children in Python
+_QUERY_CACHE = {
+    "invocation": Query(JAVA_LANGUAGE, "(method_invocation) @inv"),
+}
+
+# Modifier keyword -> bit. Keywords are anonymous tree-sitter nodes whose
+# type is the keyword itself, so no source text needs decoding.
+_MOD_BITS = {
+    kw: 1 << i for i, kw in enumerate((
+        "public", "private", "protected", "static", "abstract",
+        "final", "synchronized", "native", "transient", "volatile",
+        "strictfp", "default", "sealed",
+    ))
+}
+_MOD_PUBLIC = _MOD_BITS["public"]
+_MOD_PRIVATE = _MOD_BITS["private"]
+_MOD_PROTECTED = _MOD_BITS["protected"]
+_MOD_STATIC = _MOD_BITS["static"]
+_MOD_ABSTRACT = _MOD_BITS["abstract"]
+_MOD_NO_BODY = _MOD_ABSTRACT | _MOD_BITS["native"]
+
+# Modules with at least this many files are parsed on a process pool
+_PARSE_POOL_MIN_FILES = 64
+# Never fork: the server process runs other threads (the background
+# writer, request workers, driver pools) whose held locks a forked child
+# would inherit. Workers rebuild their own parser in _init_parse_worker.
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+    else "spawn")
+
+# Class + method rows accumulated before an UNWIND node write
+_WRITE_BATCH_SIZE = 1000
+
+# Rows per UNWIND write when flushing CALLS edges and synthetic methods
+_CALLS_BATCH_SIZE = 5000
+
+# Module subtree deletes, deepest level first (see delete_module_subgraph)
+_CLEAR_MODULE_STATEMENTS = [
+    """MATCH (:Java:Module {name: $name})
+             -[:CONTAINS_PACKAGE]->(:Java:Package)
+             -[:CONTAINS_CLASS]->(:Java:Class)
+             -[:HAS_METHOD]->(n:Java:Method)
+       WITH DISTINCT n
+       CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS""",
+    """MATCH (:Java:Module {name: $name})
+             -[:CONTAINS_PACKAGE]->(:Java:Package)
+             -[:CONTAINS_CLASS]->(n:Java:Class)
+       WITH DISTINCT n
+       CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS""",
+    """MATCH (:Java:Module {name: $name})
+             -[:CONTAINS_PACKAGE]->(n:Java:Package)
+       WITH DISTINCT n
+       CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 1000 ROWS""",
+    """MATCH (m:Java:Module {name: $name})
+       DETACH DELETE m""",
+]
+
+# Indexes backing the MERGE/MATCH lookups made while writing a module
+_SCHEMA_INDEXES = [
+    """CREATE INDEX java_class_full_name IF NOT EXISTS
+       FOR (c:Class) ON (c.full_name)""",
+    """CREATE INDEX java_package_full_name IF NOT EXISTS
+       FOR (p:Package) ON (p.full_name)""",
+    """CREATE INDEX java_module_name IF NOT EXISTS
+       FOR (m:Module) ON (m.name)""",
+    """CREATE INDEX java_method_full_name IF NOT EXISTS
+       FOR (m:Method) ON (m.full_name)""",
+    """CREATE INDEX java_method_name IF NOT EXISTS
+       FOR (m:Method) ON (m.name)""",
+    # Backs the browse name search; also covers Arch nodes added later
+    """CREATE FULLTEXT INDEX browse_node_names IF NOT EXISTS
+       FOR (n:Java|Arch) ON EACH [n.name]""",
+]
+
+
+def _text(source: bytes, node: Node) -> str:
+    """Decode a node's text straight from the file's source buffer."""
+    return source[node.start_byte:node.end_byte].decode("utf-8", "replace")
+
+
+class _ClassTable:
+    """Columnar (structure-of-arrays) view of the parsed classes.
+
+    Holds only the columns call resolution needs, so the per-file class
+    and method dicts can be released once they are written to Neo4j.
+    Class ``i`` owns methods ``methods_offset[i]:methods_offset[i + 1]``.
+    """
+
+    def __init__(self):
+        self.full_name: list[str] = []
+        self.name: list[str] = []
+        self.imports: list[list[str]] = []
+        self.supertypes: list[list[str]] = []
+        self.fields: list[dict[str, str]] = []
+        self.static_method_imports: list[dict[str, str]] = []
+        self.methods_offset: list[int] = [0]
+        self.method_name: list[str] = []
+        # (called name, receiver text or None) per invocation
+        self.method_invocations: list[list[tuple[str, Optional[str]]]] = []
+
+    def __len__(self) -> int:
+        return len(self.full_name)
+
+    def append(self, cls: dict):
+        self.full_name.append(cls["full_name"])
+        self.name.append(cls["name"])
+        self.imports.append(cls["imports"])
+        self.supertypes.append(cls["supertypes"])
+        self.fields.append(cls["fields"])
+        self.static_method_imports.append(cls["static_method_imports"])
+        for method in cls["methods"]:
+            self.method_name.append(method["name"])
+            self.method_invocations.append(
+                [(inv["name"], inv.get("receiver"))
+                 for inv in method["invocations"]])
+        self.methods_offset.append(len(self.method_name))
+
+    def methods(self, idx: int) -> range:
+        return range(self.methods_offset[idx], self.methods_offset[idx + 1])
+
+
+class _BackgroundWriter:
+    """Applies Neo4j writes on a worker thread, in submission order.
+
+    Used as a context manager: leaving the block waits for the queue to
+    drain. The first write failure is re-raised in the submitting thread
+    (on the next ``submit`` or on exit); later writes are then skipped.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int = 32):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._drain, daemon=True)
+
+    def __enter__(self) -> "_BackgroundWriter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if exc_type is None:
+            self._raise_if_failed()
+
+    def submit(self, fn, *args):
+        self._raise_if_failed()
+        self._queue.put((fn, args))
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise self._error
+
+    def _drain(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if self._error is not None:
+                continue
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                self._error = e
 
 
 class JavaMavenAnalyzer(BaseAnalyzer):
@@ -34,10 +207,12 @@ class JavaMavenAnalyzer(BaseAnalyzer):
     def run(self, repo_path: str, module_name: str,
             relative_path: str, neo4j_driver,
             repo_name: str = "") -> str:
-        module_path = Path(repo_path) / relative_path
+        module_path = os.path.normpath(os.path.join(repo_path, relative_path))
         self.log_info(f"Starting analysis of module '{module_name}' "
                       f"at {module_path}")
 
+        self._ensure_schema(neo4j_driver)
+
         # Phase 1: Clear existing data for this module
         self._clear_module_data(neo4j_driver, module_name)
 
@@ -49,57 +224,90 @@ class JavaMavenAnalyzer(BaseAnalyzer):
         java_files = self._walk_java_files(module_path)
         self.log_info(f"Found {len(java_files)} .java files")
 
-        # Phase 4: Parse each file
-        all_classes = []
+        # Phase 4: Parse each file; node writes run on a background
+        # thread so parsing overlaps with Neo4j round-trips
+        class_table = _ClassTable()
         packages_seen = set()
+        detected_techs: set[str] = set()
         stats = {"packages": 0, "classes": 0, "methods": 0,
                  "parse_errors": 0}
 
-        for i, java_file in enumerate(java_files, 1):
-            rel = java_file.relative_to(module_path)
-            try:
-                result = self._parse_java_file(java_file, module_path)
-                if not result or not result["classes"]:
+        # Class/method rows are flushed as UNWIND batches
+        class_rows: list[dict] = []
+        method_rows: list[dict] = []
+
+        # Walked paths all start with module_path + separator
+        rel_start = len(module_path) + len(os.sep)
+        rel_paths = [f[rel_start:] for f in java_files]
+        with closing(self._parse_files(java_files, rel_paths)) as parsed, \
+                _BackgroundWriter() as writer:
+            for i, (rel, (result, error)) in enumerate(
+                    zip(rel_paths, parsed), 1):
+                if error:
+                    stats["parse_errors"] += 1
+                    self.log_warn(
+                        f"[{i}/{len(java_files)}] Failed {rel}: {error}")
+                    continue
+
+                if result["has_error"]:
+                    self.log_warn(
+                        f"Partial parse (syntax errors): {rel}")
+                if not result["classes"]:
                     self.log_warn(f"No types found in {rel}")
                     continue
 
                 pkg = result["package"]
                 if pkg and pkg not in packages_seen:
                     packages_seen.add(pkg)
-                    self._create_package_node(
-                        neo4j_driver, module_name, pkg)
+                    writer.submit(self._create_package_node,
+                                  neo4j_driver, module_name, pkg,
+                                  result["package_short"])
                     stats["packages"] += 1
 
                 file_classes = 0
                 file_methods = 0
                 for cls in result["classes"]:
-                    self._create_class_node(neo4j_driver, cls)
+                    class_rows.append(self._class_row(cls))
                     stats["classes"] += 1
                     file_classes += 1
-                    all_classes.append(cls)
+                    class_table.append(cls)
+                    detected_techs |= class_technologies(cls)
 
                     for method in cls["methods"]:
-                        self._create_method_node(
-                            neo4j_driver, cls["full_name"], method)
+                        method_rows.append(
+                            self._method_row(cls["full_name"], method))
                         stats["methods"] += 1
                         file_methods += 1
 
+                # Classes before methods: HAS_METHOD MATCHes the class
+                if len(class_rows) + len(method_rows) >= _WRITE_BATCH_SIZE:
+                    writer.submit(self._bulk_create_classes,
+                                  neo4j_driver, class_rows)
+                    writer.submit(self._bulk_create_methods,
+                                  neo4j_driver, method_rows)
+                    class_rows, method_rows = [], []
+
                 self.log_info(
                     f"[{i}/{len(java_files)}] {rel}: "
                     f"{file_classes} types, {file_methods} methods")
 
-            except Exception as e:
-                stats["parse_errors"] += 1
-                self.log_warn(
-                    f"[{i}/{len(java_files)}] Failed {rel}: "
-                    f"{type(e).__name__}: {e}")
+            if class_rows:
+                writer.submit(self._bulk_create_classes,
+                              neo4j_driver, class_rows)
+            if method_rows:
+                writer.submit(self._bulk_create_methods,
+                              neo4j_driver, method_rows)
 
         # Phase 5: Resolve method calls
         self.log_info("Resolving method calls...")
         calls_count = self._create_calls_relationships(
-            neo4j_driver, all_classes)
+            neo4j_driver, class_table)
         self.log_info(f"Created {calls_count} CALLS relationships")
 
+        techs = sorted(detected_techs)
+        store_detected_technologies(neo4j_driver, module_name, techs)
+        self.log_info(f"Detected technologies: {techs or 'none'}")
+
         summary = (f"{stats['packages']} packages, "
                    f"{stats['classes']} classes, "
                    f"{stats['methods']} methods, "
@@ -112,71 +320,98 @@ class JavaMavenAnalyzer(BaseAnalyzer):
 
     # ----- Level 1: Directory Walk -----
 
-    def _walk_java_files(self, module_path: Path) -> list[Path]:
+    def _walk_java_files(self, module_path: str) -> list[str]:
         java_files = []
-        source_roots = [
-            module_path / "src" / "main" / "java",
-            module_path / "src" / "test" / "java",
-        ]
-        for source_root in source_roots:
-            if not source_root.is_dir():
-                self.log_info(
-                    f"Source root not found: "
-                    f"{source_root.relative_to(module_path)}")
+        for rel_root in (os.path.join("src", "main", "java"),
+                         os.path.join("src", "test", "java")):
+            source_root = os.path.join(module_path, rel_root)
+            if not os.path.isdir(source_root):
+                self.log_info(f"Source root not found: {rel_root}")
                 continue
-            self.log_info(
-                f"Walking {source_root.relative_to(module_path)}")
-            for dirpath, _, filenames in os.walk(source_root):
-                for fn in sorted(filenames):
-                    if fn.endswith(".java"):
-                        java_files.append(Path(dirpath) / fn)
+            self.log_info(f"Walking {rel_root}")
+            root_files = []
+            _scan_java_files(source_root, root_files)
+            root_files.sort()
+            java_files.extend(root_files)
         return java_files
 
     # ----- Level 2: Java AST Parsing (tree-sitter) -----
 
-    def _parse_java_file(self, file_path: Path,
-                         module_path: Path) -> Optional[dict]:
-        source = file_path.read_bytes()
+    def _parse_files(self, java_files: list[str], rel_paths: list[str]):
+        """Yield ``(result, error)`` per file, in input order.
+
+        Large modules are parsed on the shared process pool (tree-sitter
+        parsing is pure CPU); small ones in-process to skip the round trips.
+        """
+        if len(java_files) < _PARSE_POOL_MIN_FILES:
+            for java_file, rel in zip(java_files, rel_paths):
+                yield self._read_and_parse(java_file, rel)
+            return
+        pool = _shared_parse_pool()
+        try:
+            yield from pool.map(_parse_in_worker, java_files, rel_paths,
+                                chunksize=16)
+        except BrokenProcessPool:
+            _discard_parse_pool(pool)
+            raise
+
+    def _read_and_parse(self, java_file: str, rel_path: str
+                        ) -> tuple[Optional[dict], Optional[str]]:
+        try:
+            with open(java_file, "rb") as f:
+                source = f.read()
+        except OSError as e:
+            return None, f"{type(e).__name__}: {e}"
+        return self._parse_java_file(source, rel_path), None
+
+    def _parse_java_file(self, source: bytes, rel_path: str) -> dict:
+        # tree-sitter always yields a best-effort tree; syntax errors
+        # only mark the affected subtrees (reported via has_error)
         tree = self._parser.parse(source)
         root = tree.root_node
 
-        if root.has_error:
-            rel = file_path.relative_to(module_path)
-            self.log_warn(f"Partial parse (syntax errors): {rel}")
-
-        package_name = self._extract_package(root)
+        # Interned so every class dict of the file shares one string object
+        package_name = sys.intern(self._extract_package(root, source))
+        pkg_prefix = f"{package_name}." if package_name else ""
         imports, star_imports, static_method_imports = \
-            self._extract_imports(root)
+            self._extract_imports(root, source)
 
-        rel_path = file_path.relative_to(module_path)
-        is_test = str(rel_path).replace("\\", "/").startswith("src/test/")
+        is_test = rel_path.replace("\\", "/").startswith("src/test/")
 
         classes = []
-        type_nodes = [c for c in root.children
+        type_nodes = [c for c in root.named_children
                       if c.type in _TYPE_DECLARATIONS]
+        # Same imports for every class in the file: build the map once
+        import_map = self._build_import_map(imports, star_imports)
         self._extract_types_from_nodes(
-            type_nodes, package_name, is_test,
-            str(rel_path), imports, star_imports,
-            static_method_imports,
+            type_nodes, package_name, pkg_prefix, is_test,
+            rel_path, imports, star_imports,
+            static_method_imports, import_map,
             classes, source, parent_name=None)
+        source_hash = source_digest(source)
+        for cls in classes:
+            cls["source_hash"] = source_hash
 
-        return {"package": package_name, "classes": classes}
+        return {"package": package_name,
+                "package_short": package_name.rpartition(".")[2],
+                "classes": classes,
+                "has_error": root.has_error}
 
-    def _extract_package(self, root: Node) -> str:
+    def _extract_package(self, root: Node, source: bytes) -> str:
         for child in root.children:
             if child.type == "package_declaration":
                 for c in child.children:
                     if c.type in ("scoped_identifier", "identifier"):
-                        return c.text.decode("utf-8")
+                        return _text(source, c)
         return ""
 
-    def _extract_imports(self, root: Node):
+    def _extract_imports(self, root: Node, source: bytes):
         imports = []
         star_imports = []
         static_method_imports = {}  # method_name -> class_fqn
         for child in root.children:
             if child.type == "import_declaration":
-                text = child.text.decode("utf-8").strip()
+                text = _text(source, child).strip()
                 text = (text.removeprefix("import ")
                         .removesuffix(";").strip())
                 is_static = text.startswith("static ")
@@ -195,12 +430,17 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                         imports.append(class_fqn)
                 else:
                     imports.append(text)
-        return imports, star_imports, static_method_imports
+        # Generated sources often repeat imports; dedupe, keeping order
+        return (list(dict.fromkeys(imports)),
+                list(dict.fromkeys(star_imports)),
+                static_method_imports)
 
     def _extract_types_from_nodes(self, nodes, package_name: str,
-                                  is_test: bool, file_path: str,
+                                  pkg_prefix: str, is_test: bool,
+                                  file_path: str,
                                   imports: list, star_imports: list,
                                   static_method_imports: dict,
+                                  import_map: dict,
                                   classes: list,
                                   source_bytes: bytes,
                                   parent_name: Optional[str]):
@@ -212,35 +452,38 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             name_node = node.child_by_field_name("name")
             if not name_node:
                 continue
-            simple_name = name_node.text.decode("utf-8")
+            simple_name = _text(source_bytes, name_node)
 
             if parent_name:
                 full_name = f"{parent_name}.{simple_name}"
-            elif package_name:
-                full_name = f"{package_name}.{simple_name}"
             else:
-                full_name = simple_name
+                full_name = pkg_prefix + simple_name
 
             modifiers = self._get_modifiers(node)
-            is_abstract = "abstract" in modifiers
+            is_abstract = bool(modifiers & _MOD_ABSTRACT)
             visibility = self._visibility_from_modifiers(modifiers)
 
-            # Source code: full file for top-level, class body for inner
+            # Source span (byte offsets into file_path): full file for
+            # top-level, class body for inner. The text itself is re-read
+            # from disk on demand (see class_source.read_class_source).
             if parent_name:
-                source_code = source_bytes[
-                    node.start_byte:node.end_byte].decode("utf-8")
+                source_start = node.start_byte
+                source_end = node.end_byte
                 class_start_line = node.start_point[0]
             else:
-                source_code = source_bytes.decode("utf-8")
+                source_start = 0
+                source_end = len(source_bytes)
                 class_start_line = 0  # full file, lines are absolute
 
-            fields = self._extract_fields(node)
-            methods = self._extract_methods(node, class_start_line)
-            supertypes = self._extract_supertypes(node)
-            annotations = self._extract_annotations(node)
+            field_nodes, method_nodes, inner_types = \
+                self._split_body(node)
+            fields = self._extract_fields(field_nodes, source_bytes)
+            methods = self._extract_methods(method_nodes, source_bytes,
+                                            class_start_line)
+            supertypes = self._extract_supertypes(node, source_bytes)
+            annotations = self._extract_annotations(node, source_bytes)
 
             # Resolve annotation simple names to FQNs
-            import_map = self._build_import_map(imports, star_imports)
             annotations = self._resolve_annotation_fqns(
                 annotations, import_map, package_name)
             for m in methods:
@@ -260,7 +503,8 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                 "star_imports": star_imports,
                 "static_method_imports": static_method_imports,
                 "methods": methods,
-                "source_code": source_code,
+                "source_start": source_start,
+                "source_end": source_end,
                 "fields": fields,
                 "supertypes": supertypes,
                 "annotations": annotations,
@@ -268,30 +512,43 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             classes.append(cls_info)
 
             # Recurse into body for inner classes
-            body = node.child_by_field_name("body")
-            if body:
-                inner_types = [c for c in body.children
-                               if c.type in _TYPE_DECLARATIONS]
-                if inner_types:
-                    self._extract_types_from_nodes(
-                        inner_types, package_name, is_test,
-                        file_path, imports, star_imports,
-                        static_method_imports,
-                        classes, source_bytes,
-                        parent_name=full_name)
-
-    def _get_modifiers(self, node: Node) -> set[str]:
-        modifiers = set()
+            if inner_types:
+                self._extract_types_from_nodes(
+                    inner_types, package_name, pkg_prefix, is_test,
+                    file_path, imports, star_imports,
+                    static_method_imports, import_map,
+                    classes, source_bytes,
+                    parent_name=full_name)
+
+    def _split_body(self, type_node: Node):
+        """Bucket a type body's members in one pass over its children:
+        (field declarations, methods + constructors, inner types)."""
+        field_nodes, method_nodes, type_nodes = [], [], []
+        body = type_node.child_by_field_name("body")
+        if body:
+            for child in body.named_children:
+                kind = child.type
+                if kind == "field_declaration":
+                    field_nodes.append(child)
+                elif kind in ("method_declaration",
+                              "constructor_declaration"):
+                    method_nodes.append(child)
+                elif kind in _TYPE_DECLARATIONS:
+                    type_nodes.append(child)
+        return field_nodes, method_nodes, type_nodes
+
+    def _get_modifiers(self, node: Node) -> int:
+        """Modifiers of a declaration as a bitmask of _MOD_BITS."""
+        modifiers = 0
         for child in node.children:
             if child.type == "modifiers":
                 for mod_child in child.children:
-                    text = mod_child.text.decode("utf-8")
-                    if text in _MODIFIER_KEYWORDS:
-                        modifiers.add(text)
+                    modifiers |= _MOD_BITS.get(mod_child.type, 0)
                 break
         return modifiers
 
-    def _extract_annotations(self, node: Node) -> list[dict]:
+    def _extract_annotations(self, node: Node,
+                             source: bytes) -> list[dict]:
         """Extract annotations from a class or method declaration node."""
         annotations = []
         for child in node.children:
@@ -302,7 +559,7 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                         name_node = mod_child.child_by_field_name("name")
                         if name_node:
                             annotations.append({
-                                "name": name_node.text.decode("utf-8"),
+                                "name": _text(source, name_node),
                                 "arguments": None,
                             })
                     elif mod_child.type == "annotation":
@@ -310,8 +567,9 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                         name_node = mod_child.child_by_field_name("name")
                         if not name_node:
                             continue
-                        ann_name = name_node.text.decode("utf-8")
-                        args = self._extract_annotation_arguments(mod_child)
+                        ann_name = _text(source, name_node)
+                        args = self._extract_annotation_arguments(
+                            mod_child, source)
                         annotations.append({
                             "name": ann_name,
                             "arguments": args,
@@ -319,7 +577,8 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                 break
         return annotations
 
-    def _extract_annotation_arguments(self, ann_node: Node) -> dict:
+    def _extract_annotation_arguments(self, ann_node: Node,
+                                      source: bytes) -> dict:
         """Extract arguments from an annotation node into a dict."""
         args = {}
         arg_list = ann_node.child_by_field_name("arguments")
@@ -330,29 +589,29 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                 key_node = child.child_by_field_name("key")
                 value_node = child.child_by_field_name("value")
                 if key_node and value_node:
-                    key = key_node.text.decode("utf-8")
-                    value = self._annotation_value(value_node)
+                    key = _text(source, key_node)
+                    value = self._annotation_value(value_node, source)
                     args[key] = value
             elif child.type in ("string_literal", "string_fragment"):
                 # Shorthand: @GetMapping("/users") → value = "/users"
-                val = child.text.decode("utf-8").strip('"')
+                val = _text(source, child).strip('"')
                 args["value"] = val
             elif child.type == "element_value_array_initializer":
                 # Shorthand array: @GetMapping({"/a", "/b"})
-                vals = self._annotation_array_values(child)
+                vals = self._annotation_array_values(child, source)
                 args["value"] = vals
         return args
 
-    def _annotation_value(self, node: Node):
+    def _annotation_value(self, node: Node, source: bytes):
         """Extract a single annotation value (string, field access, or array)."""
         if node.type == "string_literal":
-            return node.text.decode("utf-8").strip('"')
+            return _text(source, node).strip('"')
         elif node.type == "element_value_array_initializer":
-            return self._annotation_array_values(node)
+            return self._annotation_array_values(node, source)
         elif node.type == "field_access":
-            return node.text.decode("utf-8")
+            return _text(source, node)
         else:
-            return node.text.decode("utf-8")
+            return _text(source, node)
 
     def _build_import_map(self, imports: list[str],
                           star_imports: list[str]) -> dict[str, str]:
@@ -388,112 +647,108 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             })
         return resolved
 
-    def _annotation_array_values(self, node: Node) -> list[str]:
+    def _annotation_array_values(self, node: Node,
+                                 source: bytes) -> list[str]:
         """Extract values from an array initializer like {"/a", "/b"}."""
         vals = []
         for child in node.children:
             if child.type == "string_literal":
-                vals.append(child.text.decode("utf-8").strip('"'))
+                vals.append(_text(source, child).strip('"'))
             elif child.type not in ("{", "}", ","):
-                vals.append(child.text.decode("utf-8"))
+                vals.append(_text(source, child))
         return vals
 
-    def _visibility_from_modifiers(self, modifiers: set[str]) -> str:
-        if "public" in modifiers:
+    def _visibility_from_modifiers(self, modifiers: int) -> str:
+        if modifiers & _MOD_PUBLIC:
             return "public"
-        if "protected" in modifiers:
+        if modifiers & _MOD_PROTECTED:
             return "protected"
-        if "private" in modifiers:
+        if modifiers & _MOD_PRIVATE:
             return "private"
         return "package-private"
 
-    def _extract_supertypes(self, type_node: Node) -> list[str]:
+    def _extract_supertypes(self, type_node: Node,
+                            source: bytes) -> list[str]:
         """Extract simple type names from extends/implements clauses."""
         supertypes = []
-        for child in type_node.children:
-            # class extends: superclass node
-            if child.type == "superclass":
-                for sc in child.children:
-                    if sc.type in ("type_identifier", "generic_type"):
-                        name = sc.text.decode("utf-8")
-                        if "<" in name:
-                            name = name[:name.index("<")]
-                        supertypes.append(name.strip())
-            # class implements / interface extends: super_interfaces
-            # or extends_interfaces
-            elif child.type in ("super_interfaces",
-                                "extends_interfaces"):
-                for sc in child.children:
-                    if sc.type == "type_list":
-                        for t in sc.children:
-                            if t.type in ("type_identifier",
-                                          "generic_type"):
-                                name = t.text.decode("utf-8")
-                                if "<" in name:
-                                    name = name[:name.index("<")]
-                                supertypes.append(name.strip())
-                    elif sc.type in ("type_identifier",
-                                     "generic_type"):
-                        name = sc.text.decode("utf-8")
-                        if "<" in name:
-                            name = name[:name.index("<")]
-                        supertypes.append(name.strip())
+        # class extends: superclass field
+        superclass = type_node.child_by_field_name("superclass")
+        if superclass:
+            self._append_type_names(superclass.named_children, source,
+                                    supertypes)
+        # class/enum/record implements: interfaces field (super_interfaces);
+        # interface extends: extends_interfaces (not exposed as a field)
+        interfaces = type_node.child_by_field_name("interfaces")
+        if not interfaces and type_node.type == "interface_declaration":
+            interfaces = next(
+                (c for c in type_node.named_children
+                 if c.type == "extends_interfaces"), None)
+        if interfaces:
+            for sc in interfaces.named_children:
+                if sc.type == "type_list":
+                    self._append_type_names(sc.named_children, source,
+                                            supertypes)
+                else:
+                    self._append_type_names((sc,), source, supertypes)
         return supertypes
 
-    def _extract_fields(self, type_node: Node) -> dict[str, str]:
+    def _append_type_names(self, nodes, source: bytes,
+                           supertypes: list[str]):
+        for t in nodes:
+            if t.type in ("type_identifier", "generic_type"):
+                name = _text(source, t)
+                if "<" in name:
+                    name = name[:name.index("<")]
+                supertypes.append(name.strip())
+
+    def _extract_fields(self, field_nodes: list[Node],
+                        source: bytes) -> dict[str, str]:
         """Extract field declarations: field_name -> simple type name."""
         fields = {}
-        body = type_node.child_by_field_name("body")
-        if not body:
-            return fields
-        for child in body.children:
-            if child.type == "field_declaration":
-                type_node_f = child.child_by_field_name("type")
-                if not type_node_f:
-                    continue
-                # Get simple type name (strip generics)
-                type_text = type_node_f.text.decode("utf-8")
-                # Handle generics: List<String> -> List
-                if "<" in type_text:
-                    type_text = type_text[:type_text.index("<")]
-                type_text = type_text.strip()
-                # Find declarator(s)
-                for decl in child.children:
-                    if decl.type == "variable_declarator":
-                        name_node = decl.child_by_field_name("name")
-                        if name_node:
-                            fields[name_node.text.decode("utf-8")] = \
-                                type_text
+        for child in field_nodes:
+            type_node_f = child.child_by_field_name("type")
+            if not type_node_f:
+                continue
+            # Get simple type name (strip generics)
+            type_text = _text(source, type_node_f)
+            # Handle generics: List<String> -> List
+            if "<" in type_text:
+                type_text = type_text[:type_text.index("<")]
+            type_text = type_text.strip()
+            # Find declarator(s)
+            for decl in child.children_by_field_name("declarator"):
+                if decl.type == "variable_declarator":
+                    name_node = decl.child_by_field_name("name")
+                    if name_node:
+                        fields[_text(source, name_node)] = type_text
         return fields
 
-    def _extract_methods(self, type_node: Node,
+    def _extract_methods(self, method_nodes: list[Node], source: bytes,
                          class_start_line: int) -> list[dict]:
         methods = []
-        body = type_node.child_by_field_name("body")
-        if not body:
-            return methods
-
-        for child in body.children:
+        for child in method_nodes:
             if child.type == "method_declaration":
                 name_node = child.child_by_field_name("name")
-                name = (name_node.text.decode("utf-8")
-                        if name_node else "?")
+                name = _text(source, name_node) if name_node else "?"
 
                 type_n = child.child_by_field_name("type")
-                return_type = (type_n.text.decode("utf-8")
-                               if type_n else "void")
+                return_type = _text(source, type_n) if type_n else "void"
 
-                params = self._format_params(child)
+                params = self._format_params(child, source)
                 mods = self._get_modifiers(child)
-                invocations = self._extract_invocations(child)
-                annotations = self._extract_annotations(child)
+                # Abstract, native and interface methods have no body
+                if mods & _MOD_NO_BODY:
+                    invocations = []
+                else:
+                    invocations = self._extract_invocations(child, source)
+                annotations = self._extract_annotations(child, source)
 
                 methods.append({
                     "name": name,
                     "return_type": return_type,
                     "parameters": params,
-                    "is_static": "static" in mods,
-                    "is_abstract": "abstract" in mods,
+                    "is_static": bool(mods & _MOD_STATIC),
+                    "is_abstract": bool(mods & _MOD_ABSTRACT),
                     "visibility": self._visibility_from_modifiers(mods),
                     "invocations": invocations,
                     "annotations": annotations,
@@ -503,9 +758,9 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                     - class_start_line,
                 })
             elif child.type == "constructor_declaration":
-                params = self._format_params(child)
+                params = self._format_params(child, source)
                 mods = self._get_modifiers(child)
-                invocations = self._extract_invocations(child)
+                invocations = self._extract_invocations(child, source)
 
                 methods.append({
                     "name": "<init>",
@@ -523,29 +778,26 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                 })
         return methods
 
-    def _extract_invocations(self, method_node: Node) -> list[dict]:
-        """Extract method invocations from a method body."""
+    def _extract_invocations(self, method_node: Node,
+                             source: bytes) -> list[dict]:
+        """Extract method invocations from a method body, in source order."""
         body = method_node.child_by_field_name("body")
         if not body:
             return []
         invocations = []
-        self._walk_invocations(body, invocations)
-        return invocations
-
-    def _walk_invocations(self, node: Node, invocations: list[dict]):
-        """Recursively find method_invocation nodes."""
-        if node.type == "method_invocation":
+        cursor = QueryCursor(_QUERY_CACHE["invocation"])
+        for _, captures in cursor.matches(body):
+            node = captures["inv"][0]
             name_node = node.child_by_field_name("name")
             if name_node:
-                inv = {"name": name_node.text.decode("utf-8")}
+                inv = {"name": _text(source, name_node)}
                 obj_node = node.child_by_field_name("object")
                 if obj_node:
-                    inv["receiver"] = obj_node.text.decode("utf-8")
+                    inv["receiver"] = _text(source, obj_node)
                 invocations.append(inv)
-        for child in node.children:
-            self._walk_invocations(child, invocations)
+        return invocations
 
-    def _format_params(self, method_node: Node) -> str:
+    def _format_params(self, method_node: Node, source: bytes) -> str:
         params_node = method_node.child_by_field_name("parameters")
         if not params_node:
             return ""
@@ -555,18 +807,23 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                 type_node = child.child_by_field_name("type")
                 name_node = child.child_by_field_name("name")
                 if type_node and name_node:
-                    type_str = type_node.text.decode("utf-8")
-                    name_str = name_node.text.decode("utf-8")
+                    type_str = _text(source, type_node)
+                    name_str = _text(source, name_node)
                     if child.type == "spread_parameter":
                         type_str += "..."
                     dims = child.child_by_field_name("dimensions")
                     if dims:
-                        type_str += dims.text.decode("utf-8")
+                        type_str += _text(source, dims)
                     parts.append(f"{type_str} {name_str}")
         return ", ".join(parts)
 
     # ----- Neo4j Operations -----
 
+    def _ensure_schema(self, driver):
+        with driver.session(database=neo4j_database()) as session:
+            for statement in _SCHEMA_INDEXES:
+                run_cypher_write(driver, statement, session=session)
+
     def _clear_module_data(self, driver, module_name: str):
         """Clear data for a single module. Used by single-module runs.
         For full-repo runs, Phase 0 in the pipeline handles cleanup."""
@@ -595,11 +852,7 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             DELETE a
         """)
         # Delete module and its descendants
-        run_cypher_write(driver, """
-            MATCH (m:Java:Module {name: $name})
-            OPTIONAL MATCH (m)-[*]->(n)
-            DETACH DELETE n, m
-        """, {"name": module_name})
+        delete_module_subgraph(driver, module_name)
 
     def _create_module_node(self, driver, module_name: str,
                             relative_path: str, repo_path: str,
@@ -624,9 +877,7 @@ class JavaMavenAnalyzer(BaseAnalyzer):
               "relative_path": relative_path})
 
     def _create_package_node(self, driver, module_name: str,
-                             package_name: str):
-        short_name = (package_name.rsplit(".", 1)[-1]
-                      if "." in package_name else package_name)
+                             package_name: str, short_name: str):
         run_cypher_write(driver, """
             MATCH (m:Java:Module {name: $module_name})
             MERGE (p:Java:Package {full_name: $full_name})
@@ -640,29 +891,10 @@ class JavaMavenAnalyzer(BaseAnalyzer):
               "full_name": package_name,
               "name": short_name})
 
-    def _create_class_node(self, driver, cls: dict):
+    def _class_row(self, cls: dict) -> dict:
         annotations = cls.get("annotations", [])
         supertypes = cls.get("supertypes", [])
-        run_cypher_write(driver, """
-            MATCH (p:Java:Package {full_name: $package})
-            MERGE (c:Java:Class {full_name: $full_name})
-            SET c.name = $name,
-                c.kind = $kind,
-                c.is_abstract = $is_abstract,
-                c.is_test = $is_test,
-                c.file_path = $file_path,
-                c.visibility = $visibility,
-                c.source_code = $source_code,
-                c.annotations = $annotations,
-                c.supertypes = $supertypes,
-                c.imports = $imports,
-                c.star_imports = $star_imports,
-                c.created_at = $created_at,
-                c.job_id = $job_id,
-                c.job_type = $job_type
-            MERGE (p)-[:CONTAINS_CLASS]->(c)
-        """, {
-            **self.node_meta(),
+        return {
             "package": cls["package"],
             "full_name": cls["full_name"],
             "name": cls["name"],
@@ -671,40 +903,21 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             "is_test": cls["is_test"],
             "file_path": cls["file_path"],
             "visibility": cls["visibility"],
-            "source_code": cls["source_code"],
+            "source_start": cls["source_start"],
+            "source_end": cls["source_end"],
+            "source_hash": cls["source_hash"],
             "annotations": json.dumps(annotations) if annotations else "[]",
             "supertypes": json.dumps(supertypes) if supertypes else "[]",
             "imports": cls.get("imports", []),
             "star_imports": cls.get("star_imports", []),
-        })
+        }
 
-    def _create_method_node(self, driver, class_full_name: str,
-                            method: dict):
-        full_name = f"{class_full_name}.{method['name']}"
+    def _method_row(self, class_full_name: str, method: dict) -> dict:
         annotations = method.get("annotations", [])
-        run_cypher_write(driver, """
-            MATCH (c:Java:Class {full_name: $class_name})
-            CREATE (m:Java:Method {
-                name: $name,
-                full_name: $full_name,
-                return_type: $return_type,
-                parameters: $parameters,
-                is_static: $is_static,
-                is_abstract: $is_abstract,
-                visibility: $visibility,
-                start_line: $start_line,
-                end_line: $end_line,
-                annotations: $annotations,
-                created_at: $created_at,
-                job_id: $job_id,
-                job_type: $job_type
-            })
-            CREATE (c)-[:HAS_METHOD]->(m)
-        """, {
-            **self.node_meta(),
+        return {
             "class_name": class_full_name,
             "name": method["name"],
-            "full_name": full_name,
+            "full_name": f"{class_full_name}.{method['name']}",
             "return_type": method["return_type"],
             "parameters": method["parameters"],
             "is_static": method["is_static"],
@@ -713,7 +926,53 @@ class JavaMavenAnalyzer(BaseAnalyzer):
             "start_line": method["start_line"],
             "end_line": method["end_line"],
             "annotations": json.dumps(annotations) if annotations else "[]",
-        })
+        }
+
+    def _bulk_create_classes(self, driver, rows: list[dict]):
+        run_cypher_write(driver, """
+            UNWIND $rows AS row
+            MATCH (p:Java:Package {full_name: row.package})
+            MERGE (c:Java:Class {full_name: row.full_name})
+            SET c.name = row.name,
+                c.kind = row.kind,
+                c.is_abstract = row.is_abstract,
+                c.is_test = row.is_test,
+                c.file_path = row.file_path,
+                c.visibility = row.visibility,
+                c.source_start = row.source_start,
+                c.source_end = row.source_end,
+                c.source_hash = row.source_hash,
+                c.annotations = row.annotations,
+                c.supertypes = row.supertypes,
+                c.imports = row.imports,
+                c.star_imports = row.star_imports,
+                c.created_at = $created_at,
+                c.job_id = $job_id,
+                c.job_type = $job_type
+            MERGE (p)-[:CONTAINS_CLASS]->(c)
+        """, {**self.node_meta(), "rows": rows})
+
+    def _bulk_create_methods(self, driver, rows: list[dict]):
+        run_cypher_write(driver, """
+            UNWIND $rows AS row
+            MATCH (c:Java:Class {full_name: row.class_name})
+            CREATE (m:Java:Method {
+                name: row.name,
+                full_name: row.full_name,
+                return_type: row.return_type,
+                parameters: row.parameters,
+                is_static: row.is_static,
+                is_abstract: row.is_abstract,
+                visibility: row.visibility,
+                start_line: row.start_line,
+                end_line: row.end_line,
+                annotations: row.annotations,
+                created_at: $created_at,
+                job_id: $job_id,
+                job_type: $job_type
+            })
+            CREATE (c)-[:HAS_METHOD]->(m)
+        """, {**self.node_meta(), "rows": rows})
 
     def _find_method_owner(self, called_name: str,
                            target_class: str,
@@ -722,9 +981,9 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                            ) -> Optional[str]:
         """Find which class in the hierarchy owns the method."""
         visited = set()
-        queue = [target_class]
+        queue = deque((target_class,))
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current in visited:
                 continue
             visited.add(current)
@@ -735,75 +994,84 @@ class JavaMavenAnalyzer(BaseAnalyzer):
         return None
 
     def _create_calls_relationships(self, driver,
-                                    all_classes: list[dict]) -> int:
+                                    table: _ClassTable) -> int:
+        full_names = table.full_name
+        method_names = table.method_name
+
         # Build lookup: class_full_name -> set of method names
         class_methods = {}
-        for cls in all_classes:
-            class_methods[cls["full_name"]] = {
-                m["name"] for m in cls["methods"]}
+        for ci, full_name in enumerate(full_names):
+            class_methods[full_name] = {
+                method_names[mi] for mi in table.methods(ci)}
 
         # Build lookup: simple class name -> [full_name]
         class_by_simple = {}
-        for cls in all_classes:
-            class_by_simple.setdefault(
-                cls["name"], []).append(cls["full_name"])
+        for simple_name, full_name in zip(table.name, full_names):
+            class_by_simple.setdefault(simple_name, []).append(full_name)
 
-        # Build class hierarchy: full_name -> [parent full_names]
+        # Build class hierarchy: full_name -> [parent full_names], plus
+        # the per-class import/field maps reused when resolving calls
         class_hierarchy: dict[str, list[str]] = {}
-        for cls in all_classes:
-            parent_import_map = {}
-            for imp in cls["imports"]:
-                simple = imp.rsplit(".", 1)[-1]
-                parent_import_map[simple] = imp
+        class_maps: list[tuple[dict[str, str], dict[str, str]]] = []
+        # Classes of one file share the same imports list object, so the
+        # import map is built once per file
+        import_maps: dict[int, dict[str, str]] = {}
+        for ci, full_name in enumerate(full_names):
+            # Import map: simple_name -> full_name
+            imports = table.imports[ci]
+            import_map = import_maps.get(id(imports))
+            if import_map is None:
+                import_map = {imp.rsplit(".", 1)[-1]: imp
+                              for imp in imports}
+                import_maps[id(imports)] = import_map
+
+            # Field map: field_name -> resolved full class name
+            field_type_map = {}
+            for field_name, type_name in table.fields[ci].items():
+                if type_name in import_map:
+                    field_type_map[field_name] = import_map[type_name]
+                elif type_name in class_by_simple:
+                    candidates = class_by_simple[type_name]
+                    if len(candidates) == 1:
+                        field_type_map[field_name] = candidates[0]
+            class_maps.append((import_map, field_type_map))
+
             parents = []
-            for st in cls.get("supertypes", []):
-                if st in parent_import_map:
-                    parents.append(parent_import_map[st])
+            for st in table.supertypes[ci]:
+                if st in import_map:
+                    parents.append(import_map[st])
                 elif st in class_by_simple:
                     candidates = class_by_simple[st]
                     if len(candidates) == 1:
                         parents.append(candidates[0])
             if parents:
-                class_hierarchy[cls["full_name"]] = parents
+                class_hierarchy[full_name] = parents
 
-        count = 0
         seen = set()
         synthetic_created = set()
-
-        for cls in all_classes:
-            # Build import map: simple_name -> full_name
-            import_map = {}
-            for imp in cls["imports"]:
-                simple = imp.rsplit(".", 1)[-1]
-                import_map[simple] = imp
-
+        # (called_name, target_class) -> owner; cleared whenever a
+        # synthetic method changes what the hierarchy walk can find
+        owner_cache: dict[tuple[str, str], Optional[str]] = {}
+        synthetic_rows: list[dict] = []
+        calls_pairs: list[dict] = []
+
+        for ci, (import_map, field_type_map) in enumerate(class_maps):
+            cls_full_name = full_names[ci]
             # Static method imports: method_name -> class_fqn
-            static_imports = cls.get("static_method_imports", {})
-
-            # Build field map: field_name -> resolved full class name
-            field_type_map = {}
-            for field_name, type_name in cls.get("fields", {}).items():
-                if type_name in import_map:
-                    field_type_map[field_name] = import_map[type_name]
-                elif type_name in class_by_simple:
-                    candidates = class_by_simple[type_name]
-                    if len(candidates) == 1:
-                        field_type_map[field_name] = candidates[0]
+            static_imports = table.static_method_imports[ci]
 
-            for method in cls["methods"]:
-                caller = f"{cls['full_name']}.{method['name']}"
+            for mi in table.methods(ci):
+                caller = f"{cls_full_name}.{method_names[mi]}"
 
-                for inv in method.get("invocations", []):
+                for called_name, receiver in table.method_invocations[mi]:
                     target_class = None
-                    called_name = inv["name"]
-                    receiver = inv.get("receiver")
 
                     if receiver is None or receiver == "this":
                         # Check static method imports first
                         if called_name in static_imports:
                             target_class = static_imports[called_name]
                         else:
-                            target_class = cls["full_name"]
+                            target_class = cls_full_name
                     elif receiver in import_map:
                         target_class = import_map[receiver]
                     elif receiver in class_by_simple:
@@ -818,9 +1086,14 @@ class JavaMavenAnalyzer(BaseAnalyzer):
 
                     # Find which class in the hierarchy owns
                     # the called method
-                    owner = self._find_method_owner(
-                        called_name, target_class,
-                        class_methods, class_hierarchy)
+                    key = (called_name, target_class)
+                    if key in owner_cache:
+                        owner = owner_cache[key]
+                    else:
+                        owner = self._find_method_owner(
+                            called_name, target_class,
+                            class_methods, class_hierarchy)
+                        owner_cache[key] = owner
                     # If method not found in hierarchy but
                     # target class is known, create a synthetic
                     # method node (inherited from external parent)
@@ -830,40 +1103,115 @@ class JavaMavenAnalyzer(BaseAnalyzer):
                         syn_full = f"{target_class}.{called_name}"
                         if syn_full not in synthetic_created:
                             synthetic_created.add(syn_full)
-                            run_cypher_write(driver, """
-                                MATCH (c:Java:Class {
-                                    full_name: $class_name})
-                                CREATE (m:Java:Method {
-                                    name: $name,
-                                    full_name: $full_name,
-                                    return_type: 'Object',
-                                    parameters: '',
-                                    is_static: false,
-                                    is_abstract: false,
-                                    visibility: 'public',
-                                    start_line: -1,
-                                    end_line: -1
-                                })
-                                CREATE (c)-[:HAS_METHOD]->(m)
-                            """, {
+                            synthetic_rows.append({
                                 "class_name": target_class,
                                 "name": called_name,
                                 "full_name": syn_full,
                             })
                             class_methods[target_class].add(
                                 called_name)
+                            owner_cache.clear()
                     if owner:
                         callee = f"{owner}.{called_name}"
                         if callee != caller:
                             pair = (caller, callee)
                             if pair not in seen:
                                 seen.add(pair)
-                                run_cypher_write(driver, """
-                                    MATCH (a:Java:Method {full_name: $caller})
-                                    MATCH (b:Java:Method {full_name: $callee})
-                                    MERGE (a)-[:CALLS]->(b)
-                                """, {"caller": caller,
-                                      "callee": callee})
-                                count += 1
-
-        return count
+                                calls_pairs.append({"caller": caller,
+                                                    "callee": callee})
+
+        # Synthetic methods first so the CALLS MATCHes can find them
+        for i in range(0, len(synthetic_rows), _CALLS_BATCH_SIZE):
+            run_cypher_write(driver, """
+                UNWIND $rows AS row
+                MATCH (c:Java:Class {full_name: row.class_name})
+                CREATE (m:Java:Method {
+                    name: row.name,
+                    full_name: row.full_name,
+                    return_type: 'Object',
+                    parameters: '',
+                    is_static: false,
+                    is_abstract: false,
+                    visibility: 'public',
+                    start_line: -1,
+                    end_line: -1
+                })
+                CREATE (c)-[:HAS_METHOD]->(m)
+            """, {"rows": synthetic_rows[i:i + _CALLS_BATCH_SIZE]})
+
+        for i in range(0, len(calls_pairs), _CALLS_BATCH_SIZE):
+            run_cypher_write(driver, """
+                UNWIND $pairs AS p
+                MATCH (a:Java:Method {full_name: p.caller})
+                MATCH (b:Java:Method {full_name: p.callee})
+                MERGE (a)-[:CALLS]->(b)
+            """, {"pairs": calls_pairs[i:i + _CALLS_BATCH_SIZE]})
+        return len(calls_pairs)
+
+
+def delete_module_subgraph(driver, module_name: str):
+    """Delete a Java module with its packages, classes and methods.
+
+    Goes one containment level at a time, leaves first, in bounded
+    transactions so a large module is never deleted in one transaction.
+    """
+    with driver.session(database=neo4j_database()) as session:
+        for statement in _CLEAR_MODULE_STATEMENTS:
+            run_cypher_write(driver, statement, {"name": module_name},
+                             session=session)
+
+
+def _scan_java_files(dirpath: str, out: list[str]):
+    """Recursively collect .java paths under dirpath. Like os.walk,
+    symlinked directories are not followed and unreadable ones skipped."""
+    try:
+        entries = os.scandir(dirpath)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _scan_java_files(entry.path, out)
+            elif entry.name.endswith(".java"):
+                out.append(entry.path)
+
+
+# ----- Parse pool workers -----
+
+# Per-process analyzer (and tree-sitter Parser) used by the parse pool
+_worker_analyzer: Optional[JavaMavenAnalyzer] = None
+
+# One pool for the whole process, started on first use: a repository's
+# modules are analyzed concurrently, and a pool per module would start
+# cpu_count() workers (each importing tree-sitter) for every one of them
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _shared_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                              mp_context=_POOL_CONTEXT,
+                                              initializer=_init_parse_worker)
+        return _parse_pool
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool (a worker died) so the next run starts afresh."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _init_parse_worker():
+    global _worker_analyzer
+    _worker_analyzer = JavaMavenAnalyzer(job_id="", job_type="analysis")
+
+
+def _parse_in_worker(java_file: str, rel_path: str
+                     ) -> tuple[Optional[dict], Optional[str]]:
+    return _worker_analyzer._read_and_parse(java_file, rel_path)
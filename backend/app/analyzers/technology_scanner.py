@@ -1,4 +1,5 @@
 import json
+import re
 
 from app.job_store import job_store
 from app.neo4j_client import run_cypher_write
@@ -35,9 +36,108 @@ _SUPERTYPE_SIGNALS: dict[str, str] = {
 }
 
 
+# Dotted-segment trie over _IMPORT_SIGNALS; a prefix's technology is
+# stored under the _TECH key of its last segment's node.
+_TECH = None
+
+
+def _build_import_trie() -> dict:
+    trie: dict = {}
+    for prefix, tech in _IMPORT_SIGNALS.items():
+        node = trie
+        for part in prefix.split("."):
+            node = node.setdefault(part, {})
+        node[_TECH] = tech
+    return trie
+
+
+_IMPORT_TRIE = _build_import_trie()
+
+
+def _walk_import_trie(name: str, detected: set[str]) -> dict | None:
+    """Add every signal prefix of ``name`` to ``detected`` and return the
+    trie node for ``name`` itself (None if it runs off the trie)."""
+    node = _IMPORT_TRIE
+    for part in name.split("."):
+        node = node.get(part)
+        if node is None:
+            return None
+        if _TECH in node:
+            detected.add(node[_TECH])
+    return node
+
+
+def _collect_trie_techs(node: dict, detected: set[str]):
+    for key, child in node.items():
+        if key is _TECH:
+            detected.add(child)
+        else:
+            _collect_trie_techs(child, detected)
+
+
+def match_imports(imports: list[str], star_imports: list[str]) -> set[str]:
+    detected: set[str] = set()
+    for imp in imports:
+        _walk_import_trie(imp, detected)
+    for star in star_imports:
+        # A star import signals every prefix above it and below it
+        node = _walk_import_trie(star, detected)
+        if node is not None:
+            _collect_trie_techs(node, detected)
+    return detected
+
+
+def match_annotations(annotations: list[dict]) -> set[str]:
+    return {_ANNOTATION_SIGNALS[ann["name"]] for ann in annotations
+            if ann.get("name", "") in _ANNOTATION_SIGNALS}
+
+
+def match_supertypes(supertypes: list[str]) -> set[str]:
+    return {_SUPERTYPE_SIGNALS[st] for st in supertypes
+            if st in _SUPERTYPE_SIGNALS}
+
+
+def class_technologies(cls: dict) -> set[str]:
+    """Technologies signalled by one parsed class (analyzer class dict)."""
+    detected = match_imports(cls["imports"], cls["star_imports"])
+    detected |= match_annotations(cls["annotations"])
+    for method in cls["methods"]:
+        detected |= match_annotations(method["annotations"])
+    detected |= match_supertypes(cls["supertypes"])
+    return detected
+
+
+def store_detected_technologies(driver, module_name: str,
+                                technologies: list[str]):
+    run_cypher_write(driver, """
+        MATCH (m:Java:Module {name: $name})
+        SET m.detected_technologies = $techs
+    """, {"name": module_name, "techs": technologies})
+
+
+# Stored annotation/supertype JSON can only match a signal if the raw text
+# contains one; checking that first skips json.loads for most classes.
+_ANNOTATION_PROBE = re.compile(
+    "|".join(re.escape(name) for name in _ANNOTATION_SIGNALS))
+_SUPERTYPE_PROBE = re.compile(
+    "|".join(re.escape(f'"{name}"') for name in _SUPERTYPE_SIGNALS))
+
+
+def _load_json_list(value: str | None, probe: re.Pattern) -> list:
+    if not value or not probe.search(value):
+        return []
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
 class TechnologyScanner:
-    """Detects technologies used in a module by querying the Java metamodel
-    already in Neo4j."""
+    """Detects technologies used in a module.
+
+    The Java analyzer stores ``detected_technologies`` on the Module node
+    while parsing; modules analyzed before that fall back to querying the
+    Java metamodel already in Neo4j."""
 
     def __init__(self, job_id: str, driver, module_name: str):
         self.job_id = job_id
@@ -50,10 +150,15 @@ class TechnologyScanner:
     def detect(self) -> list[str]:
         """Detect technologies and store on the Module node.
         Returns sorted list of technology keys."""
-        detected: set[str] = set()
-        detected |= self._scan_imports()
-        detected |= self._scan_annotations()
-        detected |= self._scan_supertypes()
+        with self._neo4j_session() as session:
+            stored = self._read_stored(session)
+            if stored is not None:
+                self.log_info(
+                    f"Technology scan for {self.module_name}: "
+                    f"{stored or 'none'} (from analysis)")
+                return stored
+
+            detected = self._scan_classes(session)
 
         result = sorted(detected)
         self.log_info(
@@ -66,81 +171,41 @@ class TechnologyScanner:
         config = load_config_decrypted()
         return self.driver.session(database=config.neo4j.database)
 
-    def _scan_imports(self) -> set[str]:
-        detected: set[str] = set()
-        with self._neo4j_session() as session:
-            result = session.run("""
-                MATCH (:Java:Module {name: $module_name})
-                      -[:CONTAINS_PACKAGE]->(:Java:Package)
-                      -[:CONTAINS_CLASS]->(c:Java:Class)
-                RETURN c.imports AS imports,
-                       c.star_imports AS star_imports
-            """, {"module_name": self.module_name})
-
-            for record in result:
-                for imp in (record["imports"] or []):
-                    for prefix, tech in _IMPORT_SIGNALS.items():
-                        if imp.startswith(prefix):
-                            detected.add(tech)
-                for star in (record["star_imports"] or []):
-                    for prefix, tech in _IMPORT_SIGNALS.items():
-                        if prefix.startswith(star + ".") or \
-                                star.startswith(prefix):
-                            detected.add(tech)
-        return detected
+    def _read_stored(self, session) -> list[str] | None:
+        record = session.run("""
+            MATCH (m:Java:Module {name: $module_name})
+            RETURN m.detected_technologies AS techs
+        """, {"module_name": self.module_name}).single()
+        return record["techs"] if record else None
 
-    def _scan_annotations(self) -> set[str]:
+    def _scan_classes(self, session) -> set[str]:
+        """Scan imports, class/method annotations and supertypes of every
+        class in the module with a single traversal."""
         detected: set[str] = set()
-        with self._neo4j_session() as session:
-            # Scan class and method annotations
-            result = session.run("""
-                MATCH (:Java:Module {name: $module_name})
-                      -[:CONTAINS_PACKAGE]->(:Java:Package)
-                      -[:CONTAINS_CLASS]->(c:Java:Class)
-                OPTIONAL MATCH (c)-[:HAS_METHOD]->(m:Java:Method)
-                RETURN c.annotations AS class_ann,
-                       collect(m.annotations) AS method_anns
-            """, {"module_name": self.module_name})
-
-            for record in result:
-                all_ann_strings = [record["class_ann"]]
-                all_ann_strings.extend(record["method_anns"])
-                for ann_str in all_ann_strings:
-                    if not ann_str:
-                        continue
-                    try:
-                        annotations = json.loads(ann_str)
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-                    for ann in annotations:
-                        name = ann.get("name", "")
-                        if name in _ANNOTATION_SIGNALS:
-                            detected.add(_ANNOTATION_SIGNALS[name])
-        return detected
-
-    def _scan_supertypes(self) -> set[str]:
-        detected: set[str] = set()
-        with self._neo4j_session() as session:
-            result = session.run("""
-                MATCH (:Java:Module {name: $module_name})
-                      -[:CONTAINS_PACKAGE]->(:Java:Package)
-                      -[:CONTAINS_CLASS]->(c:Java:Class)
-                WHERE c.supertypes IS NOT NULL
-                RETURN c.supertypes AS supertypes
-            """, {"module_name": self.module_name})
-
-            for record in result:
-                try:
-                    supertypes = json.loads(record["supertypes"])
-                except (json.JSONDecodeError, TypeError):
-                    continue
-                for st in supertypes:
-                    if st in _SUPERTYPE_SIGNALS:
-                        detected.add(_SUPERTYPE_SIGNALS[st])
+        result = session.run("""
+            MATCH (:Java:Module {name: $module_name})
+                  -[:CONTAINS_PACKAGE]->(:Java:Package)
+                  -[:CONTAINS_CLASS]->(c:Java:Class)
+            OPTIONAL MATCH (c)-[:HAS_METHOD]->(m:Java:Method)
+            RETURN c.imports AS imports,
+                   c.star_imports AS star_imports,
+                   c.annotations AS class_ann,
+                   c.supertypes AS supertypes,
+                   collect(m.annotations) AS method_anns
+        """, {"module_name": self.module_name})
+
+        for record in result:
+            detected |= match_imports(record["imports"] or [],
+                                      record["star_imports"] or [])
+            all_ann_strings = [record["class_ann"]]
+            all_ann_strings.extend(record["method_anns"])
+            for ann_str in all_ann_strings:
+                annotations = _load_json_list(ann_str, _ANNOTATION_PROBE)
+                detected |= match_annotations(annotations)
+            detected |= match_supertypes(
+                _load_json_list(record["supertypes"], _SUPERTYPE_PROBE))
         return detected
 
     def _store_detected(self, technologies: list[str]):
-        run_cypher_write(self.driver, """
-            MATCH (m:Java:Module {name: $name})
-            SET m.detected_technologies = $techs
-        """, {"name": self.module_name, "techs": technologies})
+        store_detected_technologies(
+            self.driver, self.module_name, technologies)
@@ -1,8 +1,11 @@
 import base64
+import importlib.util
 import json
-import urllib.request
-import urllib.error
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from fastapi import HTTPException
 
 from app.models import AtlassianConfig
@@ -17,25 +20,109 @@ def require_atlassian_configured(atl: AtlassianConfig) -> None:
         raise HTTPException(status_code=400, detail="Email is required for Cloud deployment")
 
 
-def atlassian_request(atl: AtlassianConfig, path: str) -> dict:
-    """Make an authenticated request to the Atlassian API. Returns parsed JSON."""
-    url = atl.base_url.rstrip("/") + path
+# Shared keep-alive pool: syncs make many calls to the same host, and
+# reusing connections saves a TCP + TLS handshake per request. Every
+# pooled connection stays alive so parallel fan-outs and paced refreshes
+# never reconnect; HTTP/2 multiplexes them when the h2 package is present.
+_client = httpx.Client(
+    timeout=10, follow_redirects=True,
+    headers={"Accept": "application/json"},
+    http2=importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+)
+
+# Parallel requests per atlassian_request_many call; well within what
+# Jira/Confluence rate limits tolerate
+_MAX_PARALLEL_REQUESTS = 8
+
+
+class RequestPacer:
+    """Spaces request starts at most ``rate`` per second across threads.
+
+    Unlike a sleep between serial requests, waiting only delays the next
+    start; requests already in flight overlap freely.
+    """
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            start = max(time.monotonic(), self._next)
+            self._next = start + self._interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+_pacers: dict[tuple[str, float], RequestPacer] = {}
+_pacers_lock = threading.Lock()
+
+
+def shared_pacer(atl: AtlassianConfig, rate: float) -> RequestPacer:
+    """The process-wide pacer for ``atl``'s host at ``rate`` requests/s.
+
+    Concurrent callers (two refreshes at once) share one budget instead
+    of each pacing itself to the full rate.
+    """
+    key = (atl.base_url.rstrip("/"), rate)
+    with _pacers_lock:
+        pacer = _pacers.get(key)
+        if pacer is None:
+            pacer = _pacers[key] = RequestPacer(rate)
+    return pacer
+
+
+def _auth_header(atl: AtlassianConfig) -> str:
     if atl.deployment_type == "cloud":
         credentials = base64.b64encode(f"{atl.email}:{atl.api_token}".encode()).decode()
-        auth_header = f"Basic {credentials}"
-    else:
-        auth_header = f"Bearer {atl.api_token}"
+        return f"Basic {credentials}"
+    return f"Bearer {atl.api_token}"
 
-    req = urllib.request.Request(url, headers={"Authorization": auth_header, "Accept": "application/json"})
+
+def _error_detail(body: str) -> str:
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read().decode())
-    except urllib.error.HTTPError as e:
-        body = e.read().decode(errors="replace")
-        try:
-            detail = json.loads(body).get("message", body[:200])
-        except Exception:
-            detail = body[:200]
-        raise HTTPException(status_code=400, detail=f"Jira returned {e.code}: {detail}")
-    except Exception as e:
+        return json.loads(body).get("message", body[:200])
+    except Exception:
+        return body[:200]
+
+
+def atlassian_request(atl: AtlassianConfig, path: str) -> dict:
+    """Make an authenticated request to the Atlassian API. Returns parsed JSON."""
+    url = atl.base_url.rstrip("/") + path
+    try:
+        resp = _client.get(url, headers={"Authorization": _auth_header(atl)})
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if resp.is_error:
+        detail = _error_detail(resp.text)
+        raise HTTPException(status_code=400, detail=f"Jira returned {resp.status_code}: {detail}")
+    try:
+        return resp.json()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def atlassian_request_many(atl: AtlassianConfig, paths: list[str],
+                           return_exceptions: bool = False) -> list:
+    """Fetch several API paths concurrently over the shared connection pool.
+
+    Results are in ``paths`` order. Like ``asyncio.gather``, the first
+    failure is raised unless ``return_exceptions`` is set, in which case
+    a failed path yields its HTTPException in place of the data.
+    """
+    def fetch(path: str):
+        try:
+            return atlassian_request(atl, path)
+        except HTTPException as e:
+            if return_exceptions:
+                return e
+            raise
+
+    if len(paths) <= 1:
+        return [fetch(p) for p in paths]
+    workers = min(_MAX_PARALLEL_REQUESTS, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fetch, paths))
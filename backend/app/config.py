@@ -1,5 +1,6 @@
 import base64
 import os
+import shutil
 from pathlib import Path
 
 import yaml
@@ -10,6 +11,17 @@ from app.session import session
 
 CONFIG_PATH = Path(os.environ.get("ROADMAP_CONFIG_PATH", Path(__file__).parent.parent / "config.yaml"))
 
+# libyaml-backed loader/dumper when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# (file stamp, session key) -> decrypted config; see load_config_shared
+_decrypted_cache: tuple | None = None
+# Bumped whenever the decrypted config is rebuilt (save, edit, unlock)
+_config_version = 0
+# (file stamp, has ENC( values); see has_encrypted_fields
+_encrypted_flag: tuple | None = None
+
 
 def load_config() -> AppConfig:
     if not CONFIG_PATH.exists():
@@ -17,13 +29,59 @@ def load_config() -> AppConfig:
         save_config(config)
         return config
     with open(CONFIG_PATH) as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=_YamlLoader) or {}
     return AppConfig(**data)
 
 
-def load_config_decrypted() -> AppConfig:
-    config = load_config()
+def _config_stamp() -> tuple[int, int] | None:
+    try:
+        st = CONFIG_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_config_shared() -> AppConfig:
+    """The cached decrypted config, shared between callers: read only.
+
+    Rebuilt when the file changes (mtime/size) or the session key changes
+    (unlock/lock). Use load_config_decrypted() for a copy to modify.
+    """
+    global _decrypted_cache, _config_version
     key = session.get_key()
+    stamp = _config_stamp()
+    if (stamp is not None and _decrypted_cache is not None
+            and _decrypted_cache[0] == (stamp, key)):
+        return _decrypted_cache[1]
+    config = _decrypt_config(load_config(), key)
+    _config_version += 1
+    if stamp is not None:
+        _decrypted_cache = ((stamp, key), config)
+    return config
+
+
+def load_config_decrypted() -> AppConfig:
+    """Load the config with secrets decrypted.
+
+    Served from the shared cache; callers get a deep copy they are free
+    to mutate.
+    """
+    return load_config_shared().model_copy(deep=True)
+
+
+def config_version() -> int:
+    """Counter that changes whenever the decrypted config may have changed;
+    lets callers key their own caches on the current config."""
+    load_config_shared()
+    return _config_version
+
+
+def neo4j_database() -> str:
+    """Neo4j database name, without copying the whole config."""
+    return load_config_shared().neo4j.database
+
+
+def _decrypt_config(config: AppConfig, key: bytes | None) -> AppConfig:
     if key is None:
         return config
     if is_encrypted(config.neo4j.password):
@@ -50,6 +108,8 @@ def _normalize_path(p: str) -> str:
 
 
 def save_config(config: AppConfig) -> None:
+    global _decrypted_cache
+    _decrypted_cache = None
     for repo in config.repositories:
         repo.path = _normalize_path(repo.path)
         for mod in repo.modules:
@@ -73,13 +133,34 @@ def save_config(config: AppConfig) -> None:
             config.whisper.api_key = encrypt_value(config.whisper.api_key, key)
         if config.logzio.api_token and not is_encrypted(config.logzio.api_token):
             config.logzio.api_token = encrypt_value(config.logzio.api_token, key)
-    with open(CONFIG_PATH, "w") as f:
-        yaml.dump(config.model_dump(), f, default_flow_style=False, sort_keys=False)
+    # Write to a temp file and rename so a crash never leaves a torn config.
+    # The rename targets the real file (a symlinked config stays a link),
+    # and the new file is private until it takes over the old one's mode.
+    target = Path(os.path.realpath(CONFIG_PATH))
+    tmp_path = target.with_name(target.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        yaml.dump(config.model_dump(), f, Dumper=_YamlDumper,
+                  default_flow_style=False, sort_keys=False)
+    if target.exists():
+        shutil.copymode(target, tmp_path)
+    os.replace(tmp_path, target)
 
 
 def has_encrypted_fields() -> bool:
-    if not CONFIG_PATH.exists():
+    """Whether the config file holds encrypted values.
+
+    Checked on every locked-app guard, so the answer is kept until the
+    file changes instead of re-reading the whole file each request.
+    """
+    global _encrypted_flag
+    stamp = _config_stamp()
+    if stamp is None:
         return False
-    with open(CONFIG_PATH) as f:
-        content = f.read()
-    return "ENC(" in content
+    if _encrypted_flag is not None and _encrypted_flag[0] == stamp:
+        return _encrypted_flag[1]
+    with open(CONFIG_PATH, "rb") as f:
+        found = b"ENC(" in f.read()
+    _encrypted_flag = (stamp, found)
+    return found
@@ -1,6 +1,9 @@
 import re
 
-_WRITE_KEYWORDS = re.compile(
+# String literals are matched (and skipped) in the same left-to-right scan
+# as the write keywords, so keywords inside quotes never count.
+_SCANNER = re.compile(
+    r"""'[^']*'|"[^"]*"|"""
     r'\b(CREATE|MERGE|DELETE|DETACH\s+DELETE|SET|REMOVE|DROP|CALL\s*\{)',
     re.IGNORECASE,
 )
@@ -8,9 +11,8 @@ _WRITE_KEYWORDS = re.compile(
 
 def validate_read_only(cypher: str) -> tuple[bool, str]:
     """Return (is_safe, error_message). is_safe=True means read-only."""
-    stripped = re.sub(r"'[^']*'", "''", cypher)
-    stripped = re.sub(r'"[^"]*"', '""', stripped)
-    match = _WRITE_KEYWORDS.search(stripped)
-    if match:
-        return False, f"Query contains write operation: {match.group()}"
+    for match in _SCANNER.finditer(cypher):
+        keyword = match.group(1)
+        if keyword:
+            return False, f"Query contains write operation: {keyword}"
     return True, ""
@@ -1,10 +1,36 @@
 import json
+import os
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+from pydantic_core import to_json
+
 from app.config import CONFIG_PATH
 
 
+def _file_age(path: Path) -> float | None:
+    """Seconds since path was last written, or None if it is missing."""
+    try:
+        return time.time() - path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _load_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+# Serializes read-modify-write of the Confluence page index file
+_page_index_lock = threading.Lock()
+# index path -> ((mtime_ns, size), {page_id: space_key})
+_page_index_memo: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
 class JiraCache:
     def __init__(self, cache_dir: str, refresh_duration: int):
         if cache_dir:
@@ -14,45 +40,52 @@ class JiraCache:
         self._ttl = refresh_duration
 
     def is_fresh(self, path: Path) -> bool:
-        if not path.exists():
-            return False
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            cached_at = datetime.fromisoformat(data["_cached_at"])
-            age = (datetime.now(timezone.utc) - cached_at).total_seconds()
-            return age < self._ttl
-        except Exception:
-            return False
+        # The file's mtime is the write time; no need to parse the JSON
+        # for _cached_at just to decide whether to parse it again.
+        age = _file_age(path)
+        return age is not None and age < self._ttl
 
     def is_fresh_issue(self, path: Path) -> bool:
         """Smart freshness for issues: done issues never expire."""
-        if not path.exists():
-            return False
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-            if data.get("status_category") == "done":
-                return True
-            cached_at = datetime.fromisoformat(data["_cached_at"])
-            age = (datetime.now(timezone.utc) - cached_at).total_seconds()
-            return age < self._ttl
-        except Exception:
-            return False
+        return self.read_issue(path) is not None
 
     def read(self, path: Path) -> dict | None:
         if not self.is_fresh(path):
             return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        return _load_json(path)
+
+    def read_stale(self, path: Path) -> dict | None:
+        """Read a cached file whatever its age (e.g. to compare versions)."""
+        return _load_json(path)
+
+    def touch(self, path: Path) -> None:
+        """Mark a cached file as just written, still current upstream."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
 
     def read_issue(self, path: Path) -> dict | None:
         """Read a cached issue using smart freshness."""
-        if not self.is_fresh_issue(path):
+        # One open for both the age and the content; a missing file is
+        # the common miss and needs no separate exists/stat probe.
+        try:
+            with open(path, "rb") as f:
+                age = time.time() - os.fstat(f.fileno()).st_mtime
+                data = json.loads(f.read())
+        except (OSError, ValueError):
             return None
-        return json.loads(path.read_text(encoding="utf-8"))
+        if data.get("status_category") == "done" or age < self._ttl:
+            return data
+        return None
 
     def write(self, path: Path, data: dict) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
         data["_cached_at"] = datetime.now(timezone.utc).isoformat()
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        # Compact UTF-8 (what json.dumps with ensure_ascii=False and tight
+        # separators produces), encoded by pydantic's Rust serializer at a
+        # fraction of the cost; cache files are machine-read
+        path.write_bytes(to_json(data))
 
     def sprint_path(self, project_key: str, sprint_id: int) -> Path:
         return self._root / "jira" / project_key / "sprints" / f"{sprint_id}.json"
@@ -76,3 +109,46 @@ class JiraCache:
 
     def confluence_page_path(self, space_key: str, page_id: str) -> Path:
         return self._root / "confluence" / space_key / "pages" / f"{page_id}.json"
+
+    def confluence_page_index_path(self) -> Path:
+        return self._root / "confluence" / "page_index.json"
+
+    def confluence_page_space(self, page_id: str) -> str | None:
+        """The space a page was last cached under, from the page index."""
+        return self._confluence_page_index().get(page_id)
+
+    def index_confluence_pages(self, page_ids, space_key: str) -> None:
+        """Record page_id -> space_key in the page index.
+
+        The index is replaced atomically, so readers never see a
+        partial file; only entries that change cause a write.
+        """
+        path = self.confluence_page_index_path()
+        with _page_index_lock:
+            index = self._confluence_page_index()
+            changed = {pid: space_key for pid in page_ids
+                       if index.get(pid) != space_key}
+            if not changed:
+                return
+            index = {**index, **changed}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(to_json(index))
+            os.replace(tmp, path)
+            st = path.stat()
+            _page_index_memo[path] = ((st.st_mtime_ns, st.st_size), index)
+
+    def _confluence_page_index(self) -> dict:
+        """The parsed index, re-read only when the file changes."""
+        path = self.confluence_page_index_path()
+        try:
+            st = path.stat()
+        except OSError:
+            return {}
+        stamp = (st.st_mtime_ns, st.st_size)
+        memo = _page_index_memo.get(path)
+        if memo is not None and memo[0] == stamp:
+            return memo[1]
+        index = _load_json(path) or {}
+        _page_index_memo[path] = (stamp, index)
+        return index
@@ -7,7 +7,7 @@ Done issues never expire (smart freshness via JiraCache.read_issue).
 
 import logging
 
-from app.atlassian_client import atlassian_request
+from app.atlassian_client import atlassian_request, atlassian_request_many
 from app.jira_cache import JiraCache
 
 log = logging.getLogger(__name__)
@@ -15,6 +15,12 @@ log = logging.getLogger(__name__)
 _APP_TYPES = ("stash", "bitbucket", "github", "gitlab")
 
 
+def _raise_if_failed(response):
+    if isinstance(response, Exception):
+        raise response
+    return response
+
+
 def _build_issue_result(raw: dict) -> dict:
     """Extract a normalised dict from a Jira REST /issue/ response."""
     fields = raw.get("fields", {})
@@ -122,11 +128,16 @@ class JiraIssueService:
     def _fetch_dev_status(self, issue_id: str, result: dict) -> None:
         """Fetch branches, commits and PRs from Jira dev-status API."""
         base = "/rest/dev-status/latest/issue/detail"
-        for app_type in _APP_TYPES:
+        data_types = ("branch", "repository", "pullrequest")
+        # All app type / data type combinations are independent; fetch
+        # them concurrently and consume them in the original order
+        responses = iter(atlassian_request_many(self.atl, [
+            f"{base}?issueId={issue_id}&applicationType={app_type}&dataType={data_type}"
+            for app_type in _APP_TYPES for data_type in data_types
+        ], return_exceptions=True))
+        for _ in _APP_TYPES:
             try:
-                data = atlassian_request(
-                    self.atl, f"{base}?issueId={issue_id}&applicationType={app_type}&dataType=branch",
-                )
+                data = _raise_if_failed(next(responses))
                 for detail in data.get("detail", []):
                     for branch in detail.get("branches", []):
                         result["branches"].append({
@@ -137,9 +148,7 @@ class JiraIssueService:
             except Exception:
                 pass
             try:
-                data = atlassian_request(
-                    self.atl, f"{base}?issueId={issue_id}&applicationType={app_type}&dataType=repository",
-                )
+                data = _raise_if_failed(next(responses))
                 for detail in data.get("detail", []):
                     for repo in detail.get("repositories", []):
                         rn = repo.get("name", "")
@@ -155,9 +164,7 @@ class JiraIssueService:
             except Exception:
                 pass
             try:
-                data = atlassian_request(
-                    self.atl, f"{base}?issueId={issue_id}&applicationType={app_type}&dataType=pullrequest",
-                )
+                data = _raise_if_failed(next(responses))
                 for detail in data.get("detail", []):
                     for pr in detail.get("pullRequests", []):
                         result["pull_requests"].append({
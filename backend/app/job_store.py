@@ -1,8 +1,21 @@
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from app.models_jobs import Job, JobLogEntry, JobStatus
+from app.neo4j_client import mark_graph_changed
+
+# Bound once: log appends are the hot path during analysis jobs
+_UTC = timezone.utc
+_now = datetime.now
+
+# Per-job log cap. Trimmed in chunks so appends stay amortized O(1).
+_MAX_LOG_ENTRIES = 2000
+_LOG_TRIM = 200
+# Finished jobs are forgotten this long after they complete
+_FINISHED_JOB_TTL = 24 * 3600
+_PRUNE_INTERVAL = 60
 
 
 class JobStore:
@@ -21,7 +34,7 @@ class JobStore:
             module_type=module_type,
             params=params or {},
             status=JobStatus.PENDING,
-            created_at=datetime.now(timezone.utc),
+            created_at=_now(_UTC),
         )
         self._jobs[job_id] = job
         return job
@@ -30,17 +43,21 @@ class JobStore:
         return self._jobs.get(job_id)
 
     def get_all_jobs(self) -> list[Job]:
-        return sorted(self._jobs.values(),
-                      key=lambda j: j.created_at, reverse=True)
+        # Jobs are only ever inserted by create_job, in creation order, so
+        # newest-first is the dict's insertion order reversed
+        return list(reversed(self._jobs.values()))
 
     def add_log(self, job_id: str, level: str, message: str):
         job = self._jobs.get(job_id)
         if job:
-            job.log.append(JobLogEntry(
-                timestamp=datetime.now(timezone.utc),
+            log = job.log
+            log.append(JobLogEntry(
+                timestamp=_now(_UTC),
                 level=level,
                 message=message,
             ))
+            if len(log) > _MAX_LOG_ENTRIES:
+                del log[:_LOG_TRIM]
 
     def update_status(self, job_id: str, status: JobStatus,
                       error: str = None, summary: str = None):
@@ -48,13 +65,32 @@ class JobStore:
         if job:
             job.status = status
             if status == JobStatus.RUNNING:
-                job.started_at = datetime.now(timezone.utc)
+                job.started_at = _now(_UTC)
             if status in (JobStatus.COMPLETED, JobStatus.FAILED):
-                job.completed_at = datetime.now(timezone.utc)
+                job.completed_at = _now(_UTC)
+                mark_graph_changed()
             if error:
                 job.error = error
             if summary:
                 job.summary = summary
 
+    def prune(self, older_than_s: float) -> int:
+        """Drop finished jobs that completed more than older_than_s ago."""
+        cutoff = _now(_UTC) - timedelta(seconds=older_than_s)
+        stale = [job_id for job_id, job in self._jobs.items()
+                 if job.completed_at is not None
+                 and job.completed_at < cutoff]
+        for job_id in stale:
+            del self._jobs[job_id]
+        return len(stale)
+
 
 job_store = JobStore()
+
+
+async def prune_jobs_periodically():
+    """Background task (started in the app lifespan) that evicts
+    finished jobs, so a long-running server does not keep every log."""
+    while True:
+        await asyncio.sleep(_PRUNE_INTERVAL)
+        job_store.prune(_FINISHED_JOB_TTL)
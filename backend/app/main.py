@@ -1,14 +1,26 @@
+import asyncio
 import base64
+import gzip
+import hashlib
+import mimetypes
 import os
+import re
+import stat
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+import anyio
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Scope
 
+from app.job_store import prune_jobs_periodically
 from app.neo4j_client import close_neo4j_driver
 from app.routers import settings, encryption, analysis, jobs, query, browse, jira, confluence, functional, contexts, git_mining, data_flow, whisper, facets, context_assistant, browse_dir
 
@@ -59,7 +71,11 @@ def _auto_unlock():
 @asynccontextmanager
 async def _lifespan(_app: FastAPI):
     _auto_unlock()
+    if _STATIC_DIR.is_dir():
+        _preload_static()
+    pruner = asyncio.create_task(prune_jobs_periodically())
     yield
+    pruner.cancel()
     close_neo4j_driver()
 
 
@@ -112,14 +128,127 @@ app.mount("/mcp", create_mcp_sse_app())
 
 # --- Embedded frontend (production builds only) ---
 _STATIC_DIR = Path(__file__).resolve().parent / "static"
-
-
-@app.get("/{full_path:path}")
-async def _serve_frontend(full_path: str):
-    if not _STATIC_DIR.is_dir():
-        from fastapi.responses import JSONResponse
-        return JSONResponse({"detail": "Not Found"}, status_code=404)
-    resolved = (_STATIC_DIR / full_path).resolve()
-    if full_path and resolved.is_relative_to(_STATIC_DIR) and resolved.is_file():
-        return FileResponse(resolved)
-    return FileResponse(_STATIC_DIR / "index.html")
+# Resolved once; each request path is resolved (symlinks included) and
+# must stay under this prefix, as StaticFiles checks by default
+_STATIC_ROOT = str(_STATIC_DIR.resolve()) + os.sep
+
+# Files up to this size are kept in memory, revalidated against their mtime.
+# Reading and compressing one is disk and CPU work, so it happens at startup
+# and in lookup_path (on a worker thread), never on the event loop
+_MAX_CACHED_BYTES = 2 * 1024 * 1024
+# path -> (mtime_ns, content, gzipped content or None, media type, etag)
+_STATIC_CACHE: dict[str, tuple[int, bytes, bytes | None, str, str]] = {}
+# Build output with a content hash in the name (main-5JQ2WQ3G.js) never
+# changes under the same name, so browsers may keep it for good
+_HASHED_ASSET = re.compile(r"-[0-9A-Z]{8}\.\w+$|\.[0-9a-f]{16,}\.\w+$")
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json",
+                       "image/svg+xml")
+
+
+def _cache_entry(path: str, st: os.stat_result):
+    entry = _STATIC_CACHE.get(path)
+    if entry is not None and entry[0] == st.st_mtime_ns:
+        return entry
+    with open(path, "rb") as f:
+        data = f.read()
+    media_type = (mimetypes.guess_type(path)[0]
+                  or "application/octet-stream")
+    gzipped = None
+    if len(data) > 1024 and media_type.startswith(_COMPRESSIBLE_TYPES):
+        gzipped = gzip.compress(data, compresslevel=6, mtime=0)
+        if len(gzipped) >= len(data):
+            gzipped = None
+    etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+    entry = (st.st_mtime_ns, data, gzipped, media_type, etag)
+    _STATIC_CACHE[path] = entry
+    return entry
+
+
+def _preload_static():
+    """Load the cacheable files of the frontend build (index.html, bundles,
+    styles) into the cache so first requests skip the disk too."""
+    for dirpath, _, filenames in os.walk(_STATIC_ROOT):
+        for fn in filenames:
+            path = os.path.join(dirpath, fn)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_size <= _MAX_CACHED_BYTES:
+                _cache_entry(path, st)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def _static_response(path: str, st: os.stat_result,
+                     request_headers: Headers, status_code: int = 200) -> Response:
+    if st.st_size > _MAX_CACHED_BYTES:
+        return FileResponse(path, stat_result=st, status_code=status_code)
+    _, data, gzipped, media_type, etag = _cache_entry(path, st)
+
+    headers = {}
+    if gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if _accepts_gzip(request_headers.get("accept-encoding", "")):
+            data = gzipped
+            etag += "-gzip"
+            headers["Content-Encoding"] = "gzip"
+    headers["ETag"] = etag = f'"{etag}"'
+    if _HASHED_ASSET.search(path):
+        headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        headers["Cache-Control"] = "no-cache"
+    if_none_match = request_headers.get("if-none-match", "")
+    if status_code == 200 and etag in (tag.strip().removeprefix("W/")
+                                       for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, status_code=status_code,
+                    media_type=media_type, headers=headers)
+
+
+class _FrontendFiles(StaticFiles):
+    """StaticFiles for the Angular build: in-memory cached responses, and
+    index.html for any path that is not a file (client-side routes)."""
+
+    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
+        candidate = os.path.realpath(os.path.join(_STATIC_ROOT, path))
+        if not (candidate + os.sep).startswith(_STATIC_ROOT):
+            return "", None
+        try:
+            st = os.stat(candidate)
+        except (FileNotFoundError, NotADirectoryError):
+            return "", None
+        # Runs on a worker thread: (re)load a changed file here so that
+        # file_response, called on the event loop, finds it cached
+        if stat.S_ISREG(st.st_mode) and st.st_size <= _MAX_CACHED_BYTES:
+            _cache_entry(candidate, st)
+        return candidate, st
+
+    def file_response(self, full_path, stat_result: os.stat_result,
+                      scope: Scope, status_code: int = 200) -> Response:
+        return _static_response(str(full_path), stat_result,
+                                Headers(scope=scope), status_code)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as exc:
+            if exc.status_code != 404:
+                raise
+        index, st = await anyio.to_thread.run_sync(
+            self.lookup_path, "index.html")
+        if st is None:
+            raise HTTPException(status_code=404)
+        return self.file_response(index, st, scope)
+
+
+# Mounted last so every API router and /mcp take precedence
+if _STATIC_DIR.is_dir():
+    app.mount("/", _FrontendFiles(directory=_STATIC_DIR, html=True),
+              name="frontend")
@@ -7,7 +7,11 @@ Provides tools for granular context access:
 - ``list_contexts``: discover available context names
 """
 
+import codecs
+import functools
+import io
 import json
+import os
 import subprocess
 from pathlib import Path
 
@@ -17,7 +21,8 @@ from starlette.applications import Starlette
 from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 
-from app.config import CONFIG_PATH, load_config_decrypted
+from app.config import (CONFIG_PATH, config_version, load_config_decrypted,
+                        load_config_shared)
 from app.jira_cache import JiraCache
 from app.jira_issue_service import JiraIssueService
 from app.bitbucket_service import BitbucketService
@@ -26,10 +31,25 @@ from app.analyzers.functional_doc import _clean_confluence_html
 mcp = FastMCP("roadmap")
 
 
-def _render_items(items: list[dict], config, cache) -> list[dict]:
-    """Render a list of item dicts into section dicts."""
+def _render_items(items: list[dict], config, cache,
+                  rendered: dict[str, dict] | None = None,
+                  repos: dict | None = None) -> list[dict]:
+    """Render a list of item dicts into section dicts.
+
+    ``repos`` maps repository names to their config (see _repos_by_name).
+
+    ``rendered`` maps an item's JSON to its section, so an item that is
+    reachable through several mixins is only rendered once per call.
+    """
+    if repos is None:
+        repos = _repos_by_name(config)
     sections = []
     for item in items:
+        if rendered is not None:
+            memo_key = json.dumps(item, sort_keys=True, default=str)
+            if memo_key in rendered:
+                sections.append(dict(rendered[memo_key]))
+                continue
         item_type = item.get("type")
         item_id = item.get("id", "")
         label = item.get("label", item.get("title", "Untitled"))
@@ -46,14 +66,14 @@ def _render_items(items: list[dict], config, cache) -> list[dict]:
         elif item_type == "git_repo":
             content = _render_git_repo(item_id, label, item.get("path", ""))
         elif item_type == "repo_file":
-            content = _render_repo_file(item, config)
+            content = _render_repo_file(item, repos)
         elif item_type == "bitbucket_pr":
             content = _render_bitbucket_pr(
                 BitbucketService(config.atlassian, cache), item_id, label)
         elif item_type == "commits":
-            content = _render_commits(item, config)
+            content = _render_commits(item, repos)
         elif item_type == "inquiry":
-            content = _render_inquiry(item, config, cache)
+            content = _render_inquiry(item, config, cache, repos)
         elif item_type == "scratch_dir":
             content = _render_scratch_dir(item_id, label)
         elif item_type == "logzio":
@@ -70,13 +90,63 @@ def _render_items(items: list[dict], config, cache) -> list[dict]:
             "content": content,
         }
         if item_type == "git_repo":
-            repo = next((r for r in config.repositories if r.name == item_id), None)
+            repo = repos.get(item_id)
             section["path"] = repo.path if repo else item.get("path", "")
-        sections.append(section)
+        if rendered is not None:
+            rendered[memo_key] = section
+        sections.append(dict(section))
     return sections
 
 
-def render_context_sections(name: str, visited: set[str] | None = None) -> list[dict]:
+def _repos_by_name(config) -> dict:
+    """Repository configs by name; the first wins on duplicate names."""
+    repos = {}
+    for r in config.repositories:
+        repos.setdefault(r.name, r)
+    return repos
+
+
+# (config version, config, cache, repos) shared by renders until the
+# config changes
+_render_env: tuple | None = None
+
+
+def _render_config():
+    """Decrypted config, Jira cache and repositories by name for rendering.
+
+    Reused across calls until the config changes, so a render (and each
+    mixin it expands) does not decrypt the config again. Read only.
+    """
+    global _render_env
+    version = config_version()
+    if _render_env is None or _render_env[0] != version:
+        config = load_config_shared()
+        cache = JiraCache(config.atlassian.cache_dir,
+                          config.atlassian.refresh_duration)
+        _render_env = (version, config, cache, _repos_by_name(config))
+    return _render_env[1:]
+
+
+# The caches below are keyed on the file's mtime and size, so an edited
+# file is simply a new key. Their results are shared: read only.
+
+@functools.lru_cache(maxsize=256)
+def _read_context_cached(path: str, mtime_ns: int, size: int) -> dict:
+    from app.routers.contexts import _read_context
+    return _read_context(Path(path))
+
+
+@functools.lru_cache(maxsize=512)
+def _confluence_page_text(path: str, mtime_ns: int, size: int,
+                          space_key: str) -> tuple[str, str]:
+    """(space key, cleaned body text) of a cached Confluence page."""
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
+    return (data.get("space_key", space_key),
+            _clean_confluence_html(data.get("body_html", "")))
+
+
+def render_context_sections(name: str) -> list[dict]:
     """Render each item in a context as a separate section dict.
 
     Returns a list of {type, id, label, content} dicts.
@@ -84,13 +154,20 @@ def render_context_sections(name: str, visited: set[str] | None = None) -> list[
 
     If name contains '/', it's treated as 'parent/child' and
     returns parent items followed by child items.
+    """
+    config, cache, repos = _render_config()
+    return _render_context(name, set(), {}, config, cache, repos)
+
+
+def _render_context(name: str, visited: set[str],
+                    rendered: dict[str, dict], config, cache,
+                    repos: dict) -> list[dict]:
+    """Recursive part of render_context_sections.
 
     The ``visited`` set prevents infinite recursion when mixins
-    reference each other.
+    reference each other; a mixin is expanded at its first reference
+    only. ``rendered`` is shared with _render_items.
     """
-    if visited is None:
-        visited = set()
-
     if name in visited:
         return []
     visited.add(name)
@@ -100,13 +177,11 @@ def render_context_sections(name: str, visited: set[str] | None = None) -> list[
     child_name = parts[1] if len(parts) > 1 else None
 
     ctx_path = CONFIG_PATH.parent / "contexts" / f"{parent_name}.json"
-    if not ctx_path.exists():
+    try:
+        st = ctx_path.stat()
+    except OSError:
         return []
-
-    from app.routers.contexts import _read_context
-    ctx = _read_context(ctx_path)
-    config = load_config_decrypted()
-    cache = JiraCache(config.atlassian.cache_dir, config.atlassian.refresh_duration)
+    ctx = _read_context_cached(str(ctx_path), st.st_mtime_ns, st.st_size)
 
     parent_items = ctx.get("items", [])
 
@@ -119,23 +194,30 @@ def render_context_sections(name: str, visited: set[str] | None = None) -> list[
                     # Expand parent items, which may themselves contain mixins
                     for pi in parent_items:
                         if pi.get("type") == "mixin":
-                            sections.extend(render_context_sections(pi["id"], visited))
+                            sections.extend(_render_context(
+                                pi["id"], visited, rendered,
+                                config, cache, repos))
                         else:
-                            sections.extend(_render_items([pi], config, cache))
+                            sections.extend(_render_items(
+                                [pi], config, cache, rendered, repos))
                 elif item.get("type") == "mixin":
-                    sections.extend(render_context_sections(item["id"], visited))
+                    sections.extend(_render_context(
+                        item["id"], visited, rendered, config, cache, repos))
                 else:
-                    sections.extend(_render_items([item], config, cache))
+                    sections.extend(_render_items(
+                        [item], config, cache, rendered, repos))
             return sections
-        return _render_items(parent_items, config, cache)
+        return _render_items(parent_items, config, cache, rendered, repos)
 
     # Top-level: render parent items, expanding mixins
     sections = []
     for item in parent_items:
         if item.get("type") == "mixin":
-            sections.extend(render_context_sections(item["id"], visited))
+            sections.extend(_render_context(
+                item["id"], visited, rendered, config, cache, repos))
         else:
-            sections.extend(_render_items([item], config, cache))
+            sections.extend(_render_items(
+                [item], config, cache, rendered, repos))
     return sections
 
 
@@ -242,56 +324,92 @@ def get_context(name: str) -> str:
         f"For example: ######### {first_label} BEGIN #########"
     )
 
-    # Sections with delimiters
-    parts = []
+    # Sections with delimiters, written straight into one buffer
+    buf = io.StringIO()
+    buf.write(toc)
+    buf.write(delimiter_hint)
+    write = buf.write
     for s in sections:
-        parts.append(
-            f"######### {s['label']} BEGIN #########\n\n"
-            f"{s['content']}\n\n"
-            f"######### {s['label']} END #########"
-        )
+        # Piecewise writes: no per-section copy of the (large) content
+        label = s["label"]
+        write("\n\n######### ")
+        write(label)
+        write(" BEGIN #########\n\n")
+        write(s["content"])
+        write("\n\n######### ")
+        write(label)
+        write(" END #########")
+    return buf.getvalue()
 
-    return toc + delimiter_hint + "\n\n" + "\n\n".join(parts)
+
+# (file stamps, listing) from the last list_contexts call
+_contexts_listing: tuple | None = None
 
 
 @mcp.tool()
 def list_contexts() -> str:
     """List all available context names (including sub-contexts as parent/child)."""
+    global _contexts_listing
     ctx_dir = CONFIG_PATH.parent / "contexts"
     if not ctx_dir.exists():
         return "No contexts directory found."
 
+    # Context files are rewritten in place, which leaves the directory
+    # mtime alone: stamp every file, which is still far cheaper than
+    # parsing them all
+    stamps = []
+    with os.scandir(ctx_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                stamps.append((entry.name, st.st_mtime_ns, st.st_size))
+    stamps = tuple(sorted(stamps))
+    if _contexts_listing is not None and _contexts_listing[0] == stamps:
+        return _contexts_listing[1]
+
     lines = []
-    for f in sorted(ctx_dir.glob("*.json")):
-        ctx = json.loads(f.read_text(encoding="utf-8"))
+    for file_name, _, _ in stamps:
+        f = ctx_dir / file_name
+        ctx = json.loads(f.read_bytes())
         name = ctx.get("name", f.stem)
         lines.append(f"- {name}")
         for child in ctx.get("children", []):
             lines.append(f"  - {name}/{child['name']}")
 
     if not lines:
-        return "No contexts found."
-
-    return "Available contexts:\n" + "\n".join(lines)
-
+        listing = "No contexts found."
+    else:
+        listing = "Available contexts:\n" + "\n".join(lines)
+    _contexts_listing = (stamps, listing)
+    return listing
 
 
 def _render_confluence_page(cache: JiraCache, config, page_id: str,
                             label: str) -> str:
     """Render a Confluence page's content as text."""
-    # Search across all configured spaces
-    for space in config.atlassian.confluence_spaces:
-        p = cache.confluence_page_path(space.key, page_id)
-        if p.exists():
-            data = json.loads(p.read_text(encoding="utf-8"))
-            body_html = data.get("body_html", "")
-            clean_text = _clean_confluence_html(body_html)
-            return (
-                f"## {label} (Confluence Page)\n"
-                f"**Space:** {data.get('space_key', space.key)} | "
-                f"**Page ID:** {page_id}\n\n"
-                f"{clean_text}"
-            )
+    # The page index names the page's space; search the other configured
+    # spaces only if it has no entry or the file is gone
+    spaces = [s.key for s in config.atlassian.confluence_spaces]
+    known = cache.confluence_page_space(page_id)
+    if known in spaces:
+        spaces.remove(known)
+        spaces.insert(0, known)
+    for space_key in spaces:
+        p = cache.confluence_page_path(space_key, page_id)
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if space_key != known:
+            cache.index_confluence_pages([page_id], space_key)
+        page_space, clean_text = _confluence_page_text(
+            str(p), st.st_mtime_ns, st.st_size, space_key)
+        return (
+            f"## {label} (Confluence Page)\n"
+            f"**Space:** {page_space} | "
+            f"**Page ID:** {page_id}\n\n"
+            f"{clean_text}"
+        )
 
     return f"## {label} (Confluence Page)\n**Page ID:** {page_id}\n\n(Page not found in cache)"
 
@@ -317,11 +435,12 @@ def _render_jira_issue(svc: JiraIssueService, issue_key: str, label: str) -> str
     comments = data.get("comments", [])
     if comments:
         lines.append(f"\n### Comments ({len(comments)})")
-        for c in comments[:10]:  # limit to 10 most recent
-            lines.append(
-                f"\n**{c.get('author', 'Unknown')}** "
-                f"({c.get('created', '')[:10]}):\n{c.get('body', '')}"
-            )
+        # Jira returns comments oldest first: keep the 10 most recent
+        lines.extend(
+            f"\n**{c.get('author', 'Unknown')}** "
+            f"({c.get('created', '')[:10]}):\n{c.get('body', '')}"
+            for c in comments[-10:]
+        )
 
     return "\n".join(lines)
 
@@ -424,13 +543,13 @@ def _render_git_repo(repo_name: str, label: str, path: str) -> str:
     )
 
 
-def _render_commits(item: dict, config) -> str:
+def _render_commits(item: dict, repos: dict) -> str:
     """Render a list of commits by their hashes via live git show."""
     repo_name = item.get("repo_name", "")
     hashes = item.get("hashes", [])
     label = item.get("label", item.get("title", "Commits"))
 
-    repo = next((r for r in config.repositories if r.name == repo_name), None)
+    repo = repos.get(repo_name)
     if not repo:
         return f"## {label} (Commits)\n\nRepository '{repo_name}' not found in config."
 
@@ -486,13 +605,13 @@ _LANG_MAP = {
 }
 
 
-def _render_repo_file(item: dict, config) -> str:
+def _render_repo_file(item: dict, repos: dict) -> str:
     """Render a single file from a repository with full content."""
     repo_name = item.get("repo_name", "")
     rel_path = item.get("file_path", "")
     label = item.get("label", rel_path)
 
-    repo = next((r for r in config.repositories if r.name == repo_name), None)
+    repo = repos.get(repo_name)
     if not repo:
         return f"## {label} (Repository File)\n\n(Repository '{repo_name}' not found)"
 
@@ -501,16 +620,23 @@ def _render_repo_file(item: dict, config) -> str:
         return f"## {label} (Repository File)\n\n(File not found: {rel_path})"
 
     try:
-        size = full.stat().st_size
-        if size > _MAX_FILE_SIZE:
-            content = full.read_text(encoding="utf-8")[:_MAX_FILE_SIZE]
+        # Read at most one byte past the cap, never the whole file
+        with open(full, "rb") as f:
+            raw = f.read(_MAX_FILE_SIZE + 1)
+        truncated = len(raw) > _MAX_FILE_SIZE
+        # A cut may split a multi-byte character: drop that tail only
+        content = codecs.getincrementaldecoder("utf-8")().decode(
+            raw[:_MAX_FILE_SIZE], final=not truncated)
+        if truncated:
+            size = full.stat().st_size
             content += f"\n\n... (truncated, file is {size:,} bytes)"
-        else:
-            content = full.read_text(encoding="utf-8")
     except (UnicodeDecodeError, OSError) as e:
         return f"## {label} (Repository File)\n\n(Cannot read file: {e})"
 
-    ext = full.suffix.lstrip(".")
+    # Same as full.suffix without the dot: none for "Makefile" or ".bashrc"
+    stem, _, ext = full.name.rpartition(".")
+    if not stem:
+        ext = ""
     lang = _LANG_MAP.get(ext, ext)
 
     return (
@@ -572,7 +698,7 @@ def _upsert_inquiry(name: str, inquiry_type: str, params: dict, label: str) -> N
     if not ctx_path.exists():
         return
 
-    ctx = json.loads(ctx_path.read_text(encoding="utf-8"))
+    ctx = json.loads(ctx_path.read_bytes())
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
 
     if child_name:
@@ -647,7 +773,7 @@ def _render_git_repo_detail(repo_name: str, label: str, path: str) -> str:
     return "\n".join(lines)
 
 
-def _render_inquiry(item: dict, config, cache) -> str:
+def _render_inquiry(item: dict, config, cache, repos: dict) -> str:
     """Render an agent inquiry by fetching live data for the referenced resource."""
     inquiry_type = item.get("inquiry_type", "")
     params = item.get("params", {})
@@ -665,7 +791,7 @@ def _render_inquiry(item: dict, config, cache) -> str:
 
     if inquiry_type == "git_repo":
         repo_name = params.get("repo_name", "")
-        repo = next((r for r in config.repositories if r.name == repo_name), None)
+        repo = repos.get(repo_name)
         if not repo:
             return header + f"## {label}\n\nRepository '{repo_name}' not found in config."
         return header + _render_git_repo_detail(repo_name, label, repo.path)
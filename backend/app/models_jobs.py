@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -12,7 +13,10 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
-class JobLogEntry(BaseModel):
+# A plain slotted dataclass: one is created per log line, and pydantic
+# only needs to handle them when a Job is serialized
+@dataclass(slots=True)
+class JobLogEntry:
     timestamp: datetime
     level: str
     message: str
@@ -1,46 +1,98 @@
+from contextlib import contextmanager
+
 from neo4j import GraphDatabase
 
-from app.config import load_config_decrypted
+from app.config import load_config_decrypted, neo4j_database
 
+# Process-wide driver; it owns the Bolt connection pool, so it is reused
+# across requests. Saving new connection settings retires it (see
+# retire_stale_neo4j_driver) rather than closing it under running jobs.
 _driver = None
+_driver_settings = None
+# Drivers replaced after a settings change; jobs started before it may
+# still hold them, so they are only closed at shutdown
+_retired_drivers = []
 
 
 def get_neo4j_driver():
-    global _driver
+    global _driver, _driver_settings
     if _driver is None:
-        config = load_config_decrypted()
-        neo4j = config.neo4j
+        neo4j = load_config_decrypted().neo4j
         _driver = GraphDatabase.driver(neo4j.uri, auth=(neo4j.username, neo4j.password))
+        _driver_settings = (neo4j.uri, neo4j.username, neo4j.password)
     return _driver
 
 
+def retire_stale_neo4j_driver():
+    """After a settings save: if the connection settings changed, let the
+    next get_neo4j_driver() build a new driver. Call while unlocked, so the
+    password compared is the decrypted one."""
+    global _driver, _driver_settings
+    if _driver is None:
+        return
+    neo4j = load_config_decrypted().neo4j
+    if (neo4j.uri, neo4j.username, neo4j.password) != _driver_settings:
+        _retired_drivers.append(_driver)
+        _driver = None
+        _driver_settings = None
+
+
 def close_neo4j_driver():
-    global _driver
+    global _driver, _driver_settings
+    for driver in _retired_drivers:
+        driver.close()
+    _retired_drivers.clear()
     if _driver is not None:
         _driver.close()
         _driver = None
+        _driver_settings = None
+
+
+# Bumped on every write through run_cypher_write and whenever a job (all
+# of which write to the graph) finishes; read-side caches key on it
+_graph_version = 0
+
 
+def mark_graph_changed():
+    global _graph_version
+    _graph_version += 1
 
-def run_cypher_write(driver, query: str, parameters: dict = None):
-    config = load_config_decrypted()
-    with driver.session(database=config.neo4j.database) as session:
-        result = session.run(query, parameters or {})
+
+def graph_version() -> int:
+    return _graph_version
+
+
+@contextmanager
+def _session_scope(driver, session=None):
+    """Use the caller's open session if given, otherwise open one."""
+    if session is not None:
+        yield session
+        return
+    with driver.session(database=neo4j_database()) as own:
+        yield own
+
+
+def run_cypher_write(driver, query: str, parameters: dict = None,
+                     session=None):
+    with _session_scope(driver, session) as s:
+        result = s.run(query, parameters or {})
         result.consume()
+    mark_graph_changed()
 
 
-def run_cypher_read(driver, query: str, parameters: dict = None) -> list[dict]:
+def run_cypher_read(driver, query: str, parameters: dict = None,
+                    session=None) -> list[dict]:
     """Execute a read-only Cypher query and return rows as dicts."""
-    config = load_config_decrypted()
-    with driver.session(database=config.neo4j.database) as s:
+    with _session_scope(driver, session) as s:
         result = s.run(query, parameters or {})
         return [dict(r) for r in result]
 
 
-def run_cypher_read_graph(driver, query: str, parameters: dict = None) -> dict:
+def run_cypher_read_graph(driver, query: str, parameters: dict = None,
+                          session=None) -> dict:
     """Execute a read-only Cypher query and return nodes + relationships."""
-    config = load_config_decrypted()
-    with driver.session(database=config.neo4j.database) as session:
-        result = session.run(query, parameters or {})
+    with _session_scope(driver, session) as s:
+        result = s.run(query, parameters or {})
         graph = result.graph()
         nodes = []
         for node in graph.nodes:
@@ -1,10 +1,18 @@
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
-from openai import OpenAI
+from openai import AsyncOpenAI, BadRequestError
+from pydantic import ValidationError
 
-from app.config import load_config_decrypted
+from app.config import load_config_shared
 from app.models import AnalyzeRequest, AnalyzeResponse, ModuleConfig
 from app.session import session
 
@@ -21,6 +29,119 @@ def _find_analysis_provider(config):
     return provider
 
 
+# Parsed LLM answers keyed by (model endpoint, repo structure hash), so
+# re-analyzing an unchanged repository skips the model round trip
+_ANALYSIS_CACHE_SIZE = 64
+_analysis_cache: dict[str, list[ModuleConfig]] = {}
+
+# Structured output: the reply must be {"modules": [...]}. Strict schemas
+# need an object root and every property listed as required.
+_MODULES_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "modules",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "modules": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "type": {"type": "string", "enum": ["java", "angular"]},
+                            "relative_path": {"type": "string"},
+                        },
+                        "required": ["name", "type", "relative_path"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["modules"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# A reply wrapped in a Markdown code fence, with or without a language
+# tag or closing fence; group 1 is the payload
+_FENCE_RE = re.compile(r"^```[\w-]*[ \t]*\n?(.*?)(?:\n?```)?\s*$", re.S)
+
+_MAX_DEPENDENCIES = 30
+_RAW_FALLBACK = 1000
+# Subdirectories probed concurrently (listing + pom/package.json reads)
+_MAX_PARALLEL_PROBES = 16
+
+
+def _distill_pom(text: str) -> dict | str:
+    """Keep only what identifies a Maven module: its coordinates, child
+    modules and dependency artifactIds. Falls back to a short raw prefix."""
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError:
+        return text[:_RAW_FALLBACK]
+
+    def tag(el):
+        return el.tag.rpartition("}")[2]
+
+    def child(el, name):
+        return next((c for c in el if tag(c) == name), None)
+
+    def text_of(el, name):
+        c = child(el, name) if el is not None else None
+        return (c.text or "").strip() if c is not None else None
+
+    result = {"artifactId": text_of(root, "artifactId")}
+    packaging = text_of(root, "packaging")
+    if packaging:
+        result["packaging"] = packaging
+    parent = text_of(child(root, "parent"), "artifactId")
+    if parent:
+        result["parent"] = parent
+    modules = child(root, "modules")
+    if modules is not None:
+        result["modules"] = [(m.text or "").strip() for m in modules if tag(m) == "module"]
+    deps = child(root, "dependencies")
+    if deps is not None:
+        result["dependencies"] = [text_of(d, "artifactId") for d in deps if tag(d) == "dependency"][:_MAX_DEPENDENCIES]
+    return result
+
+
+def _distill_package_json(text: str) -> dict | str:
+    """Keep the package name and dependency names; versions, scripts and
+    the rest do not help classify a module."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return text[:_RAW_FALLBACK]
+    if not isinstance(data, dict):
+        return text[:_RAW_FALLBACK]
+    result = {"name": data.get("name")}
+    for key in ("dependencies", "peerDependencies", "devDependencies"):
+        deps = data.get(key)
+        if isinstance(deps, dict) and deps:
+            result[key] = list(deps)[:_MAX_DEPENDENCIES]
+    return result
+
+
+def _probe_dir(path: Path, dir_name: str) -> dict:
+    dir_path = path / dir_name
+    detail = {"name": dir_name, "files": []}
+    names = []
+    try:
+        with os.scandir(dir_path) as it:
+            names = sorted(e.name for e in it if not e.name.startswith("."))
+    except PermissionError:
+        pass
+    if "pom.xml" in names:
+        detail["pom_xml"] = _distill_pom((dir_path / "pom.xml").read_text(encoding="utf-8", errors="replace"))
+    if "package.json" in names:
+        detail["package_json"] = _distill_package_json((dir_path / "package.json").read_text(encoding="utf-8", errors="replace"))
+    detail["files"] = names[:50]
+    return detail
+
+
 def _read_repo_structure(repo_path: str) -> dict:
     path = Path(repo_path)
     if not path.exists() or not path.is_dir():
@@ -34,40 +155,46 @@ def _read_repo_structure(repo_path: str) -> dict:
         "module_details": [],
     }
 
-    for entry in sorted(path.iterdir()):
-        if entry.name.startswith("."):
-            continue
-        if entry.is_file():
-            result["top_level_files"].append(entry.name)
-        elif entry.is_dir():
-            result["top_level_dirs"].append(entry.name)
-
-    pom_path = path / "pom.xml"
-    if pom_path.exists():
-        result["pom_xml"] = pom_path.read_text(encoding="utf-8", errors="replace")[:8000]
-
-    pkg_path = path / "package.json"
-    if pkg_path.exists():
-        result["package_json"] = pkg_path.read_text(encoding="utf-8", errors="replace")[:4000]
-
-    for dir_name in result["top_level_dirs"]:
-        dir_path = path / dir_name
-        detail = {"name": dir_name, "files": []}
-        sub_pom = dir_path / "pom.xml"
-        sub_pkg = dir_path / "package.json"
-        if sub_pom.exists():
-            detail["pom_xml_snippet"] = sub_pom.read_text(encoding="utf-8", errors="replace")[:4000]
-        if sub_pkg.exists():
-            detail["package_json_snippet"] = sub_pkg.read_text(encoding="utf-8", errors="replace")[:2000]
-        try:
-            detail["files"] = [e.name for e in sorted(dir_path.iterdir()) if not e.name.startswith(".")][:50]
-        except PermissionError:
-            pass
-        result["module_details"].append(detail)
+    # One scandir pass per directory: DirEntry caches the file type, and
+    # pom.xml / package.json presence comes from the listed names.
+    with os.scandir(path) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if entry.name.startswith("."):
+                continue
+            if entry.is_file():
+                result["top_level_files"].append(entry.name)
+            elif entry.is_dir():
+                result["top_level_dirs"].append(entry.name)
+
+    top_files = set(result["top_level_files"])
+    if "pom.xml" in top_files:
+        result["pom_xml"] = _distill_pom((path / "pom.xml").read_text(encoding="utf-8", errors="replace"))
+    if "package.json" in top_files:
+        result["package_json"] = _distill_package_json((path / "package.json").read_text(encoding="utf-8", errors="replace"))
+
+    dirs = result["top_level_dirs"]
+    if len(dirs) <= 1:
+        result["module_details"] = [_probe_dir(path, d) for d in dirs]
+    else:
+        workers = min(_MAX_PARALLEL_PROBES, len(dirs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            result["module_details"] = list(pool.map(lambda d: _probe_dir(path, d), dirs))
 
     return result
 
 
+@functools.lru_cache(maxsize=8)
+def _openai_client(api_key: str, base_url: str) -> AsyncOpenAI:
+    """One client (and connection pool) per provider endpoint, reused
+    across requests instead of a fresh TLS setup per analysis."""
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+def _analysis_cache_key(provider, repo_structure: dict) -> str:
+    digest = hashlib.sha256(json.dumps(repo_structure, sort_keys=True).encode()).hexdigest()
+    return f"{provider.base_url}|{provider.default_model}|{digest}"
+
+
 def _build_prompt(repo_structure: dict) -> str:
     return f"""Analyze this repository structure and identify all software modules.
 
@@ -78,14 +205,14 @@ For each module, determine:
 
 Repository structure:
 ```json
-{json.dumps(repo_structure, indent=2)}
+{json.dumps(repo_structure, separators=(",", ":"))}
 ```
 
-Respond with ONLY a JSON array of objects with keys "name", "type", "relative_path". Example:
-[
+Example answer:
+{{"modules": [
   {{"name": "core-api", "type": "java", "relative_path": "core-api"}},
   {{"name": "web-ui", "type": "angular", "relative_path": "frontend"}}
-]
+]}}
 
 Rules:
 - Only include actual software modules (skip docs, scripts, config directories)
@@ -98,12 +225,20 @@ Rules:
 """
 
 
+def _rejects_response_format(error: BadRequestError) -> bool:
+    """Whether a 400 is about the structured output request itself."""
+    if error.param == "response_format":
+        return True
+    detail = f"{error.message} {error.body}".lower()
+    return "response_format" in detail or "json_schema" in detail
+
+
 @router.post("/analyze", response_model=AnalyzeResponse)
-def analyze_repository(request: AnalyzeRequest):
+async def analyze_repository(request: AnalyzeRequest):
     if not session.is_unlocked():
         raise HTTPException(status_code=403, detail="App is locked")
 
-    config = load_config_decrypted()
+    config = load_config_shared()
 
     if request.repo_index < 0 or request.repo_index >= len(config.repositories):
         raise HTTPException(status_code=400, detail="Invalid repository index")
@@ -111,36 +246,49 @@ def analyze_repository(request: AnalyzeRequest):
     repo = config.repositories[request.repo_index]
     provider = _find_analysis_provider(config)
 
-    repo_structure = _read_repo_structure(repo.path)
+    repo_structure = await asyncio.to_thread(_read_repo_structure, repo.path)
 
-    client = OpenAI(api_key=provider.api_key, base_url=provider.base_url)
+    cache_key = _analysis_cache_key(provider, repo_structure)
+    found = _analysis_cache.get(cache_key)
 
     try:
-        response = client.chat.completions.create(
-            model=provider.default_model,
-            messages=[
-                {"role": "system", "content": "You are a software architecture analyst. Respond only with valid JSON."},
-                {"role": "user", "content": _build_prompt(repo_structure)},
-            ],
-            temperature=0.1,
-            max_tokens=2000,
-        )
-
-        content = response.choices[0].message.content.strip()
-        if content.startswith("```"):
-            content = content.split("\n", 1)[1]
-            content = content.rsplit("```", 1)[0]
-
-        modules_data = json.loads(content)
+        if found is None:
+            client = _openai_client(provider.api_key, provider.base_url)
+            completion_args = dict(
+                model=provider.default_model,
+                messages=[
+                    {"role": "system", "content": "You are a software architecture analyst. Respond only with valid JSON."},
+                    {"role": "user", "content": _build_prompt(repo_structure)},
+                ],
+                temperature=0.1,
+                max_tokens=2000,
+            )
+            try:
+                response = await client.chat.completions.create(
+                    **completion_args, response_format=_MODULES_RESPONSE_FORMAT)
+            except BadRequestError as e:
+                # Older models and many OpenAI-compatible servers reject
+                # json_schema; the prompt alone asks for the same object.
+                # Any other 400 would fail the same way again
+                if not _rejects_response_format(e):
+                    raise
+                response = await client.chat.completions.create(**completion_args)
+
+            content = response.choices[0].message.content.strip()
+            fenced = _FENCE_RE.match(content)
+            if fenced:
+                content = fenced.group(1)
+
+            found = AnalyzeResponse.model_validate_json(content).modules
+            if len(_analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+                _analysis_cache.pop(next(iter(_analysis_cache)))
+            _analysis_cache[cache_key] = found
+
         repo_path = Path(repo.path)
-        modules = []
-        for m in modules_data:
-            mod = ModuleConfig(**m)
-            if (repo_path / mod.relative_path).is_dir():
-                modules.append(mod)
+        modules = [m for m in found if (repo_path / m.relative_path).is_dir()]
         return AnalyzeResponse(modules=modules)
 
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse AI response as JSON: {e}")
+    except ValidationError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse AI response: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI analysis failed: {e}")
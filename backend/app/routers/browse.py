@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException
+import re
+import time
+from typing import TypedDict
 
-from app.config import load_config_decrypted
-from app.neo4j_client import get_neo4j_driver
+from fastapi import APIRouter, HTTPException, Response
+from neo4j import READ_ACCESS, RoutingControl
+from neo4j.exceptions import ClientError
+from pydantic import TypeAdapter
+
+from app.config import config_version, neo4j_database
+from app.neo4j_client import get_neo4j_driver, graph_version
 from app.session import session
 
 router = APIRouter(prefix="/api/browse", tags=["browse"])
@@ -12,68 +19,137 @@ def _require_unlocked():
         raise HTTPException(status_code=403, detail="App is locked")
 
 
+# ----- Result cache for /search and /tree -----
+# Tree clicks and type-ahead search repeat the same queries. Entries
+# expire after a short TTL, and at once when the graph or config changes.
+# The cache holds the encoded JSON body, so a hit skips serialization too.
+
+_RESULT_TTL = 60
+_RESULT_CACHE_SIZE = 1024
+_result_cache: dict[tuple, tuple] = {}
+
+
+def _cache_versions() -> tuple[int, int]:
+    return graph_version(), config_version()
+
+
+def _cached_result(key: tuple) -> bytes | None:
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+    expires, versions, body = entry
+    if expires < time.monotonic() or versions != _cache_versions():
+        _result_cache.pop(key, None)
+        return None
+    return body
+
+
+def _cache_result(key: tuple, versions: tuple[int, int], body: bytes):
+    """Store a body, stamped with the versions read before the query ran."""
+    if len(_result_cache) >= _RESULT_CACHE_SIZE:
+        _result_cache.pop(next(iter(_result_cache), None), None)
+    _result_cache[key] = (time.monotonic() + _RESULT_TTL, versions, body)
+
+
+def _json_response(body: bytes, cache_status: str) -> Response:
+    return Response(content=body, media_type="application/json",
+                    headers={"X-Cache": cache_status})
+
+
+# Row shapes, so pydantic's compiled serializer can encode the plain row
+# dicts straight to JSON bytes, without the jsonable_encoder walk
+class _TreeNode(TypedDict):
+    id: str
+    labels: list[str]
+    name: str
+    has_children: bool
+    kind: str
+
+
+class _SearchHit(TypedDict):
+    id: str
+    labels: list[str]
+    name: str
+    detail: str
+
+
+_TREE_JSON = TypeAdapter(list[_TreeNode])
+_SEARCH_JSON = TypeAdapter(list[_SearchHit])
+
+
+def _compact(query: str) -> str:
+    """Strip the Python indentation and blank lines from a Cypher query,
+    once at import, so each request sends the shortest text."""
+    return "\n".join(
+        line.strip() for line in query.splitlines() if line.strip())
+
+
 # ----- Technical hierarchy: label -> (relationship, child label) -----
 
-_TECHNICAL_LEVELS = {
-    "root": {
-        "query": """
-            MATCH (n:Java:Repository)
-            RETURN elementId(n) AS id, labels(n) AS labels,
-                   n.name AS name, n.full_name AS detail,
-                   EXISTS { MATCH (n)-[:CONTAINS_MODULE]->() } AS has_children,
-                   'repository' AS kind
-            ORDER BY n.name
-        """,
-    },
-    "Repository": {
-        "query": """
-            MATCH (parent)
-            WHERE elementId(parent) = $parent_id
-            MATCH (parent)-[:CONTAINS_MODULE]->(n:Java:Module)
-            RETURN elementId(n) AS id, labels(n) AS labels,
-                   n.name AS name, n.name AS detail,
-                   EXISTS { MATCH (n)-[:CONTAINS_PACKAGE]->() } AS has_children,
-                   'module' AS kind
-            ORDER BY n.name
-        """,
-    },
-    "Module": {
-        "query": """
-            MATCH (parent)
-            WHERE elementId(parent) = $parent_id
-            MATCH (parent)-[:CONTAINS_PACKAGE]->(n:Java:Package)
-            RETURN elementId(n) AS id, labels(n) AS labels,
-                   n.full_name AS name, n.full_name AS detail,
-                   EXISTS { MATCH (n)-[:CONTAINS_CLASS]->() } AS has_children,
-                   'package' AS kind
-            ORDER BY n.full_name
-        """,
-    },
-    "Package": {
-        "query": """
-            MATCH (parent)
-            WHERE elementId(parent) = $parent_id
-            MATCH (parent)-[:CONTAINS_CLASS]->(n:Java:Class)
-            RETURN elementId(n) AS id, labels(n) AS labels,
-                   n.name AS name, n.full_name AS detail,
-                   EXISTS { MATCH (n)-[:HAS_METHOD]->() } AS has_children,
-                   n.kind AS kind
-            ORDER BY n.name
-        """,
-    },
-    "Class": {
-        "query": """
-            MATCH (parent)
-            WHERE elementId(parent) = $parent_id
-            MATCH (parent)-[:HAS_METHOD]->(n:Java:Method)
-            RETURN elementId(n) AS id, labels(n) AS labels,
-                   n.name AS name, n.full_name AS detail,
-                   false AS has_children,
-                   'method' AS kind
-            ORDER BY n.name
-        """,
-    },
-}
+_TECHNICAL_ROOT = """
+    MATCH (n:Java:Repository)
+    RETURN elementId(n) AS id, labels(n) AS labels,
+           n.name AS name,
+           EXISTS { MATCH (n)-[:CONTAINS_MODULE]->() } AS has_children,
+           'repository' AS kind
+    ORDER BY n.name
+"""
+
+# Children of a parent at each level, in label-detection priority order.
+# Each returns the tree columns plus a sort_key.
+_TECHNICAL_LEVELS = [
+    ("Class", """
+        MATCH (parent)-[:HAS_METHOD]->(n:Java:Method)
+        RETURN elementId(n) AS id, labels(n) AS labels,
+               n.name AS name,
+               false AS has_children,
+               'method' AS kind, n.name AS sort_key
+    """),
+    ("Package", """
+        MATCH (parent)-[:CONTAINS_CLASS]->(n:Java:Class)
+        RETURN elementId(n) AS id, labels(n) AS labels,
+               n.name AS name,
+               EXISTS { MATCH (n)-[:HAS_METHOD]->() } AS has_children,
+               n.kind AS kind, n.name AS sort_key
+    """),
+    ("Module", """
+        MATCH (parent)-[:CONTAINS_PACKAGE]->(n:Java:Package)
+        RETURN elementId(n) AS id, labels(n) AS labels,
+               n.full_name AS name,
+               EXISTS { MATCH (n)-[:CONTAINS_CLASS]->() } AS has_children,
+               'package' AS kind, n.full_name AS sort_key
+    """),
+    ("Repository", """
+        MATCH (parent)-[:CONTAINS_MODULE]->(n:Java:Module)
+        RETURN elementId(n) AS id, labels(n) AS labels,
+               n.name AS name,
+               EXISTS { MATCH (n)-[:CONTAINS_PACKAGE]->() } AS has_children,
+               'module' AS kind, n.name AS sort_key
+    """),
+]
+
+
+def _children_query(levels: list[tuple[str, str]]) -> str:
+    """One query that detects the parent's level from its labels and
+    returns its children, instead of a labels round-trip first."""
+    detect = " ".join(f"WHEN parent:{label} THEN '{label}'"
+                      for label, _ in levels)
+    branches = "\n        UNION ALL\n".join(
+        f"""
+        WITH parent, level
+        WITH parent, level WHERE level = '{label}'
+        {body.strip()}"""
+        for label, body in levels)
+    return f"""
+        MATCH (parent)
+        WHERE elementId(parent) = $parent_id
+        WITH parent, CASE {detect} END AS level
+        CALL {{{branches}
+        }}
+        RETURN id, labels, name, has_children, kind
+        ORDER BY sort_key
+    """
+
 
 # ----- Architecture hierarchy: Microservice -> categories -> Arch nodes -----
 
@@ -97,31 +173,34 @@ _MS_TO_CLASS = """
     WITH DISTINCT cls
 """
 
-# Count queries per category, scoped to a microservice ($ms_id)
-_MS_COUNT_QUERIES = {
-    "rest-apis": _MS_TO_CLASS + """
-        MATCH (:Arch:RESTInterface)-[:IMPLEMENTED_BY]->(cls)
-        RETURN count(cls) AS c
-    """,
-    "feign-clients": _MS_TO_CLASS + """
-        MATCH (:Arch:FeignClient)-[:IMPLEMENTED_BY]->(cls)
-        RETURN count(cls) AS c
-    """,
-    "jms": None,  # handled specially in _count_jms_for_ms
-    "scheduled-tasks": _MS_TO_CLASS + """
-        MATCH (cls)-[:HAS_METHOD]->(meth:Java:Method)
-              <-[:IMPLEMENTED_BY]-(:Arch:ScheduledTask)
-        RETURN count(meth) AS c
-    """,
-    "http-clients": _MS_TO_CLASS + """
-        MATCH (:Arch:HTTPClient)-[:IMPLEMENTED_BY]->(cls)
-        RETURN count(cls) AS c
-    """,
-    "repositories": _MS_TO_CLASS + """
-        MATCH (:Arch:Repository)-[:IMPLEMENTED_BY]->(cls)
-        RETURN count(cls) AS c
-    """,
-}
+# Per category, a pattern that matches when a class (cls) of the
+# microservice contributes to it; JMS has a listener and a producer path
+_MS_CATEGORY_PATTERNS = [
+    ("rest-apis", "MATCH (:Arch:RESTInterface)-[:IMPLEMENTED_BY]->(cls)"),
+    ("feign-clients", "MATCH (:Arch:FeignClient)-[:IMPLEMENTED_BY]->(cls)"),
+    ("jms", """MATCH (cls)-[:HAS_METHOD]->(:Java:Method)
+              <-[:IMPLEMENTED_BY]-(:Arch:JMSListener)
+              -[:LISTENS_ON]->(:Arch:JMSDestination)"""),
+    ("jms", """MATCH (p:Arch:JMSProducer)-[:IMPLEMENTED_BY]->(cls)
+        MATCH (p)-[:SENDS_TO]->(:Arch:JMSDestination)"""),
+    ("scheduled-tasks", """MATCH (cls)-[:HAS_METHOD]->(:Java:Method)
+              <-[:IMPLEMENTED_BY]-(:Arch:ScheduledTask)"""),
+    ("http-clients", "MATCH (:Arch:HTTPClient)-[:IMPLEMENTED_BY]->(cls)"),
+    ("repositories", "MATCH (:Arch:Repository)-[:IMPLEMENTED_BY]->(cls)"),
+]
+
+# Non-empty categories of a microservice ($ms_id), in one round trip
+_MS_CATEGORIES_QUERY = _MS_TO_CLASS + """
+    WITH collect(cls) AS classes
+    CALL {""" + "\n        UNION ALL".join(f"""
+        WITH classes
+        UNWIND classes AS cls
+        {pattern}
+        RETURN '{key}' AS category LIMIT 1"""
+    for key, pattern in _MS_CATEGORY_PATTERNS) + """
+    }
+    RETURN DISTINCT category
+"""
 
 # Data queries per category, scoped to a microservice ($ms_id)
 _MS_VIRTUAL_QUERIES = {
@@ -143,7 +222,28 @@ _MS_VIRTUAL_QUERIES = {
                'feign-client' AS kind
         ORDER BY name
     """,
-    "jms": None,  # handled specially in _get_jms_for_ms
+    # Destinations reached via listeners or producers; UNION dedupes
+    "jms": _MS_TO_CLASS + """
+        WITH collect(cls) AS classes
+        CALL {
+            WITH classes
+            UNWIND classes AS cls
+            MATCH (cls)-[:HAS_METHOD]->(:Java:Method)
+                  <-[:IMPLEMENTED_BY]-(:Arch:JMSListener)
+                  -[:LISTENS_ON]->(dest:Arch:JMSDestination)
+            RETURN dest
+            UNION
+            WITH classes
+            UNWIND classes AS cls
+            MATCH (p:Arch:JMSProducer)-[:IMPLEMENTED_BY]->(cls)
+            MATCH (p)-[:SENDS_TO]->(dest:Arch:JMSDestination)
+            RETURN dest
+        }
+        RETURN elementId(dest) AS id, labels(dest) AS labels,
+               dest.name AS name, true AS has_children,
+               'jms-destination' AS kind
+        ORDER BY name
+    """,
     "scheduled-tasks": _MS_TO_CLASS + """
         MATCH (cls)-[:HAS_METHOD]->(meth:Java:Method)
               <-[:IMPLEMENTED_BY]-(n:Arch:ScheduledTask)
@@ -225,26 +325,35 @@ _ARCH_NODE_LEVELS = {
     """,
 }
 
-# Map perspective name -> level definitions
+_MS_CATEGORIES_QUERY = _compact(_MS_CATEGORIES_QUERY)
+_MS_VIRTUAL_QUERIES = {
+    key: _compact(q) for key, q in _MS_VIRTUAL_QUERIES.items()}
+_ARCH_NODE_LEVELS = {
+    label: _compact(q) for label, q in _ARCH_NODE_LEVELS.items()}
+
+# Map perspective name -> (root query, children query)
 _PERSPECTIVES = {
-    "technical": _TECHNICAL_LEVELS,
+    "technical": (_compact(_TECHNICAL_ROOT),
+                  _compact(_children_query(_TECHNICAL_LEVELS))),
 }
 
 
-def _detect_level(labels: list[str]) -> str:
-    """Detect which hierarchy level a node is at from its labels."""
-    for label in ("Class", "Package", "Module", "Repository"):
-        if label in labels:
-            return label
-    return "root"
+def _tree_rows(records) -> list[dict]:
+    """Tree nodes from records with the columns id, labels, name,
+    has_children, kind, in that order (unpacked, not looked up by key)."""
+    return [
+        {"id": node_id, "labels": labels, "name": name,
+         "has_children": has_children, "kind": kind or ""}
+        for node_id, labels, name, has_children, kind in records
+    ]
 
 
-def _detect_arch_level(labels: list[str]) -> str:
-    """Detect which arch hierarchy level a node is at."""
-    for label in ("RESTInterface", "FeignClient", "JMSDestination"):
+def _arch_level_query(labels: list[str]) -> str | None:
+    """The children query for the first arch level the node is at."""
+    for label, query in _ARCH_NODE_LEVELS.items():
         if label in labels:
-            return label
-    return ""
+            return query
+    return None
 
 
 @router.get("/search")
@@ -255,39 +364,71 @@ def search_nodes(q: str, limit: int = 20):
     if not q or len(q) < 2:
         return []
 
-    cypher = """
-        MATCH (n)
-        WHERE (n:Java OR n:Arch)
-          AND n.name IS NOT NULL
-          AND toLower(n.name) CONTAINS toLower($q)
-        RETURN elementId(n) AS id, labels(n) AS labels,
-               n.name AS name,
-               COALESCE(n.full_name, n.name) AS detail
-        ORDER BY
-            CASE WHEN toLower(n.name) STARTS WITH toLower($q)
-                 THEN 0 ELSE 1 END,
-            n.name
-        LIMIT $limit
-    """
-
+    key = ("search", q, limit)
+    body = _cached_result(key)
+    if body is not None:
+        return _json_response(body, "HIT")
+    versions = _cache_versions()
+    body = _SEARCH_JSON.dump_json(_search_nodes(q, limit))
+    _cache_result(key, versions, body)
+    return _json_response(body, "MISS")
+
+
+# Name search. Both variants filter and order identically; the fulltext
+# one (index created by the Java analyzer) only narrows the candidates
+# first instead of scanning every Java/Arch node.
+_SEARCH_FILTER = """
+    WHERE n.name IS NOT NULL
+      AND toLower(n.name) CONTAINS toLower($q)
+    RETURN elementId(n) AS id, labels(n) AS labels,
+           n.name AS name,
+           COALESCE(n.full_name, n.name) AS detail
+    ORDER BY
+        CASE WHEN toLower(n.name) STARTS WITH toLower($q)
+             THEN 0 ELSE 1 END,
+        n.name
+    LIMIT $limit
+"""
+_SEARCH_FULLTEXT = _compact("""
+    CALL db.index.fulltext.queryNodes('browse_node_names', $term)
+    YIELD node AS n
+""" + _SEARCH_FILTER)
+_SEARCH_SCAN = _compact("""
+    MATCH (n) WHERE (n:Java OR n:Arch)
+    WITH n
+""" + _SEARCH_FILTER)
+
+# Index tokens split on punctuation and whitespace, so a wildcard term
+# only finds substrings made of word characters; anything else scans.
+# ASCII only: CJK text is tokenized per character, so a multi-character
+# CJK term would match nothing in the index.
+_FULLTEXT_SAFE = re.compile(r"\w+", re.ASCII)
+
+
+def _search_nodes(q: str, limit: int) -> list[dict]:
     driver = get_neo4j_driver()
+    params = {"q": q, "limit": limit}
     try:
-        config = load_config_decrypted()
-        with driver.session(database=config.neo4j.database) as db_session:
-            result = db_session.run(cypher, {"q": q, "limit": limit})
-            return [
-                {
-                    "id": r["id"],
-                    "labels": r["labels"],
-                    "name": r["name"],
-                    "detail": r["detail"],
-                }
-                for r in result
-            ]
+        records = None
+        if _FULLTEXT_SAFE.fullmatch(q):
+            try:
+                records, _, _ = driver.execute_query(
+                    _SEARCH_FULLTEXT, {**params, "term": f"*{q.lower()}*"},
+                    database_=neo4j_database(),
+                    routing_=RoutingControl.READ)
+            except ClientError:
+                # Index not created yet (no Java analysis since upgrade)
+                records = None
+        if records is None:
+            records, _, _ = driver.execute_query(
+                _SEARCH_SCAN, params,
+                database_=neo4j_database(), routing_=RoutingControl.READ)
+        return [
+            {"id": node_id, "labels": labels, "name": name, "detail": detail}
+            for node_id, labels, name, detail in records
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {e}")
-    finally:
-        pass
 
 
 @router.get("/tree")
@@ -296,57 +437,55 @@ def get_tree_children(perspective: str = "technical",
     """Get children for a tree node in the given perspective."""
     _require_unlocked()
 
+    key = ("tree", perspective, parent_id)
+    body = _cached_result(key)
+    if body is not None:
+        return _json_response(body, "HIT")
+    versions = _cache_versions()
+    body = _TREE_JSON.dump_json(
+        _get_tree_children(perspective, parent_id))
+    _cache_result(key, versions, body)
+    return _json_response(body, "MISS")
+
+
+def _get_tree_children(perspective: str,
+                       parent_id: str | None) -> list[dict]:
     # Architecture perspective has special handling
     if perspective == "architecture":
         return _get_arch_tree(parent_id)
 
-    levels = _PERSPECTIVES.get(perspective)
-    if not levels:
+    queries = _PERSPECTIVES.get(perspective)
+    if not queries:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown perspective: {perspective}. "
             f"Valid: technical, architecture")
+    root_query, children_query = queries
 
-    if not parent_id:
-        level_def = levels.get("root")
+    if parent_id:
+        query, params = children_query, {"parent_id": parent_id}
     else:
-        # Detect level from parent node labels
-        parent_labels = _get_node_labels(parent_id)
-        level_key = _detect_level(parent_labels)
-        level_def = levels.get(level_key)
-
-    if not level_def:
-        return []
+        query, params = root_query, None
 
     driver = get_neo4j_driver()
     try:
-        config = load_config_decrypted()
-        with driver.session(database=config.neo4j.database) as db_session:
-            params = {"parent_id": parent_id} if parent_id else {}
-            result = db_session.run(level_def["query"], params)
-            return [
-                {
-                    "id": r["id"],
-                    "labels": r["labels"],
-                    "name": r["name"],
-                    "has_children": r["has_children"],
-                    "kind": r["kind"] or "",
-                }
-                for r in result
-            ]
+        records, _, _ = driver.execute_query(
+            query, params,
+            database_=neo4j_database(), routing_=RoutingControl.READ)
+        return _tree_rows(records)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Tree query failed: {e}")
-    finally:
-        pass
 
 
 def _get_arch_tree(parent_id: str | None) -> list[dict]:
     """Handle architecture perspective tree queries."""
     driver = get_neo4j_driver()
+    version = graph_version()
     try:
-        config = load_config_decrypted()
-        with driver.session(database=config.neo4j.database) as db_session:
+        # Several dependent reads: one read-routed session for all of them
+        with driver.session(database=neo4j_database(),
+                            default_access_mode=READ_ACCESS) as db_session:
             if not parent_id:
                 # Root: return Microservice nodes
                 result = db_session.run("""
@@ -356,21 +495,13 @@ def _get_arch_tree(parent_id: str | None) -> list[dict]:
                            'microservice' AS kind
                     ORDER BY ms.name
                 """)
-                return [
-                    {
-                        "id": r["id"],
-                        "labels": r["labels"],
-                        "name": r["name"],
-                        "has_children": r["has_children"],
-                        "kind": r["kind"],
-                    }
-                    for r in result
-                ]
+                return _remember_labels(_tree_rows(result), version)
 
             if parent_id.startswith("virtual:"):
                 # Virtual category scoped to a microservice
                 # Format: "virtual:<category>@<ms_element_id>"
-                return _expand_virtual_category(db_session, parent_id)
+                return _remember_labels(
+                    _expand_virtual_category(db_session, parent_id), version)
 
             # Real node — check labels
             parent_labels = _get_node_labels_with_session(
@@ -380,96 +511,31 @@ def _get_arch_tree(parent_id: str | None) -> list[dict]:
                 # Microservice -> virtual categories with counts
                 return _get_ms_categories(db_session, parent_id)
 
-            level_key = _detect_arch_level(parent_labels)
-            query = _ARCH_NODE_LEVELS.get(level_key)
+            query = _arch_level_query(parent_labels)
             if not query:
                 return []
             result = db_session.run(query, {"parent_id": parent_id})
-            return [
-                {
-                    "id": r["id"],
-                    "labels": r["labels"],
-                    "name": r["name"],
-                    "has_children": r["has_children"],
-                    "kind": r["kind"] or "",
-                }
-                for r in result
-            ]
+            return _remember_labels(_tree_rows(result), version)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Tree query failed: {e}")
-    finally:
-        pass
 
 
 def _get_ms_categories(db_session, ms_id: str) -> list[dict]:
     """Return virtual categories for a microservice, hiding empty ones."""
-    categories = []
-    for cat in _ARCH_CATEGORIES:
-        count_q = _MS_COUNT_QUERIES.get(cat["key"])
-        if count_q:
-            result = db_session.run(count_q, {"ms_id": ms_id})
-            record = result.single()
-            count = record["c"] if record else 0
-        elif cat["key"] == "jms":
-            count = _count_jms_for_ms(db_session, ms_id)
-        else:
-            count = 1  # no count query means always show
-        if count == 0:
-            continue
-        categories.append({
+    result = db_session.run(_MS_CATEGORIES_QUERY, {"ms_id": ms_id})
+    present = {r["category"] for r in result}
+    return [
+        {
             "id": f"virtual:{cat['key']}@{ms_id}",
             "labels": ["Virtual"],
             "name": cat["name"],
             "has_children": True,
             "kind": cat["kind"],
-        })
-    return categories
-
-
-def _count_jms_for_ms(db_session, ms_id: str) -> int:
-    """Count JMS destinations connected to a microservice via two paths."""
-    # Destinations via listeners (method-level)
-    r1 = db_session.run(_MS_TO_CLASS + """
-        MATCH (cls)-[:HAS_METHOD]->(meth:Java:Method)
-              <-[:IMPLEMENTED_BY]-(:Arch:JMSListener)
-              -[:LISTENS_ON]->(dest:Arch:JMSDestination)
-        RETURN COLLECT(DISTINCT elementId(dest)) AS ids
-    """, {"ms_id": ms_id})
-    ids = set(r1.single()["ids"] or [])
-    # Destinations via producers (class-level)
-    r2 = db_session.run(_MS_TO_CLASS + """
-        MATCH (p:Arch:JMSProducer)-[:IMPLEMENTED_BY]->(cls)
-        MATCH (p)-[:SENDS_TO]->(dest:Arch:JMSDestination)
-        RETURN COLLECT(DISTINCT elementId(dest)) AS ids
-    """, {"ms_id": ms_id})
-    ids.update(r2.single()["ids"] or [])
-    return len(ids)
-
-
-def _get_jms_for_ms(db_session, ms_id: str) -> list[dict]:
-    """Get JMS destinations connected to a microservice."""
-    # Destinations via listeners
-    r1 = db_session.run(_MS_TO_CLASS + """
-        MATCH (cls)-[:HAS_METHOD]->(meth:Java:Method)
-              <-[:IMPLEMENTED_BY]-(:Arch:JMSListener)
-              -[:LISTENS_ON]->(dest:Arch:JMSDestination)
-        RETURN DISTINCT elementId(dest) AS id, labels(dest) AS labels,
-               dest.name AS name, true AS has_children,
-               'jms-destination' AS kind
-    """, {"ms_id": ms_id})
-    by_id = {r["id"]: dict(r) for r in r1}
-    # Destinations via producers
-    r2 = db_session.run(_MS_TO_CLASS + """
-        MATCH (p:Arch:JMSProducer)-[:IMPLEMENTED_BY]->(cls)
-        MATCH (p)-[:SENDS_TO]->(dest:Arch:JMSDestination)
-        RETURN DISTINCT elementId(dest) AS id, labels(dest) AS labels,
-               dest.name AS name, true AS has_children,
-               'jms-destination' AS kind
-    """, {"ms_id": ms_id})
-    for r in r2:
-        by_id.setdefault(r["id"], dict(r))
-    return sorted(by_id.values(), key=lambda d: d["name"])
+        }
+        for cat in _ARCH_CATEGORIES
+        if cat["key"] in present
+    ]
 
 
 def _expand_virtual_category(db_session, virtual_id: str) -> list[dict]:
@@ -478,40 +544,49 @@ def _expand_virtual_category(db_session, virtual_id: str) -> list[dict]:
     if "@" not in rest:
         return []
     cat_key, ms_id = rest.split("@", 1)
-    if cat_key == "jms":
-        return _get_jms_for_ms(db_session, ms_id)
     query = _MS_VIRTUAL_QUERIES.get(cat_key)
     if not query:
         return []
     result = db_session.run(query, {"ms_id": ms_id})
-    return [
-        {
-            "id": r["id"],
-            "labels": r["labels"],
-            "name": r["name"],
-            "has_children": r["has_children"],
-            "kind": r["kind"] or "",
-        }
-        for r in result
-    ]
+    return _tree_rows(result)
 
 
-def _get_node_labels(node_id: str) -> list[str]:
-    """Fetch labels for a node by elementId."""
-    driver = get_neo4j_driver()
-    try:
-        config = load_config_decrypted()
-        with driver.session(database=config.neo4j.database) as db_session:
-            return _get_node_labels_with_session(db_session, node_id)
-    finally:
-        pass
+# elementId -> (expires, graph version, labels). Labels of a node never
+# change, but element ids can be reused after deletes: hence the version.
+# Arch tree rows prime it, so expanding a listed node needs one query.
+_LABELS_TTL = 300
+_LABELS_CACHE_SIZE = 10000
+_labels_cache: dict[str, tuple[float, int, list[str]]] = {}
 
 
 def _get_node_labels_with_session(db_session, node_id: str) -> list[str]:
     """Fetch labels using an existing session."""
+    now = time.monotonic()
+    version = graph_version()
+    entry = _labels_cache.get(node_id)
+    if entry is not None and entry[0] > now and entry[1] == version:
+        return entry[2]
     result = db_session.run("""
         MATCH (n) WHERE elementId(n) = $id
         RETURN labels(n) AS labels
     """, {"id": node_id})
     record = result.single()
-    return record["labels"] if record else []
+    labels = record["labels"] if record else []
+    _store_labels(node_id, labels, version, now)
+    return labels
+
+
+def _store_labels(node_id: str, labels: list[str], version: int,
+                  now: float):
+    if len(_labels_cache) >= _LABELS_CACHE_SIZE:
+        _labels_cache.pop(next(iter(_labels_cache), None), None)
+    _labels_cache[node_id] = (now + _LABELS_TTL, version, labels)
+
+
+def _remember_labels(rows: list[dict], version: int) -> list[dict]:
+    """Record the labels of real (non-virtual) tree rows; returns rows."""
+    now = time.monotonic()
+    for row in rows:
+        if not row["id"].startswith("virtual:"):
+            _store_labels(row["id"], row["labels"], version, now)
+    return rows
@@ -1,3 +1,5 @@
+import os
+import stat
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
@@ -38,6 +40,17 @@ def _check_allowed(path: str):
                         detail="Access denied: path is outside allowed directories")
 
 
+def _stat_file(p: Path, path: str) -> os.stat_result:
+    """Stat a regular file once; the result also feeds FileResponse."""
+    try:
+        st = p.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail=f"File not found: {path}")
+    if not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=400, detail=f"Not a file: {path}")
+    return st
+
+
 @router.get("")
 def list_dir(path: str):
     """List files and directories at the given path."""
@@ -154,11 +167,7 @@ def read_file(path: str):
     _require_unlocked()
     _check_allowed(path)
     p = Path(path)
-    if not p.exists():
-        raise HTTPException(status_code=404, detail=f"File not found: {path}")
-    if not p.is_file():
-        raise HTTPException(status_code=400, detail=f"Not a file: {path}")
-    if p.stat().st_size > 500_000:
+    if _stat_file(p, path).st_size > 500_000:
         raise HTTPException(status_code=400, detail="File too large (>500KB)")
     try:
         content = p.read_text(encoding="utf-8", errors="replace")
@@ -173,12 +182,9 @@ def serve_image(path: str):
     _require_unlocked()
     _check_allowed(path)
     p = Path(path)
-    if not p.exists():
-        raise HTTPException(status_code=404, detail=f"File not found: {path}")
-    if not p.is_file():
-        raise HTTPException(status_code=400, detail=f"Not a file: {path}")
+    st = _stat_file(p, path)
     if p.suffix.lower() not in IMAGE_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Not a supported image type")
-    if p.stat().st_size > 10_000_000:
+    if st.st_size > 10_000_000:
         raise HTTPException(status_code=400, detail="Image too large (>10MB)")
-    return FileResponse(p)
+    return FileResponse(p, stat_result=st)
@@ -1,95 +1,210 @@
-import time
+import functools
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.config import load_config_decrypted, has_encrypted_fields
+from app.config import load_config_shared, has_encrypted_fields
 from app.session import session
-from app.atlassian_client import atlassian_request, require_atlassian_configured
+from app.atlassian_client import (
+    atlassian_request, atlassian_request_many, require_atlassian_configured,
+    shared_pacer,
+)
 from app.jira_cache import JiraCache
 
 router = APIRouter(prefix="/api/confluence", tags=["confluence"])
 
+# Page content refreshes: requests in flight, and request starts per
+# second (the budget the serial loop used to keep with 200ms sleeps)
+_REFRESH_WORKERS = 5
+_REFRESH_RATE = 5
+
+# Page contents fetched per CQL search ("id in (...)"), keeping the
+# request URL short
+_BULK_SIZE = 25
+
+# Threads reading one page's cache file across spaces (_read_cached_page)
+_MAX_PARALLEL_READS = 8
+
+# Parsed cache files, keyed by path and checked against the file's
+# (mtime_ns, size): any rewrite, by a refresh here or a cache write
+# elsewhere, invalidates the entry without explicit bookkeeping
+_MEMO_SIZE = 256
+_memo: dict[Path, tuple[tuple[int, int], dict]] = {}
+
 
 def _require_unlocked():
     if has_encrypted_fields() and not session.is_unlocked():
         raise HTTPException(status_code=403, detail="App is locked.")
 
 
+def _read_cached(cache, path: Path) -> dict | None:
+    """cache.read() that skips re-reading and parsing an unchanged file.
+
+    Returns a shallow copy, since handlers add "from_cache" to it.
+    """
+    if not cache.is_fresh(path):
+        return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    memo = _memo.get(path)
+    if memo is None or memo[0] != stamp:
+        data = cache.read(path)
+        if data is None:
+            return None
+        if len(_memo) >= _MEMO_SIZE:
+            _memo.pop(next(iter(_memo), None), None)
+        _memo[path] = memo = (stamp, data)
+    return dict(memo[1])
+
+
 def _get_cache() -> tuple:
-    """Return (atlassian_config, JiraCache)."""
-    config = load_config_decrypted()
+    """Check the app is unlocked, then return (atlassian_config, JiraCache);
+    the config is shared, read only."""
+    _require_unlocked()
+    config = load_config_shared()
     atl = config.atlassian
     require_atlassian_configured(atl)
-    cache = JiraCache(atl.cache_dir, atl.refresh_duration)
-    return atl, cache
+    return atl, _cache_instance(atl.cache_dir, atl.refresh_duration)
+
+
+@functools.lru_cache(maxsize=8)
+def _cache_instance(cache_dir: str, refresh_duration: int) -> JiraCache:
+    """One JiraCache per cache setting; it holds no other state, so every
+    request can share it."""
+    return JiraCache(cache_dir, refresh_duration)
+
+
+# (spaces list, {upper-cased key: space}) for the shared config's list;
+# rebuilt when a config reload brings a new list
+_spaces_index: tuple[list, dict] = ([], {})
 
 
 def _find_space(atl, space_key: str):
-    for s in atl.confluence_spaces:
-        if s.key.upper() == space_key.upper():
-            return s
-    raise HTTPException(status_code=404, detail=f"Space '{space_key}' not configured")
+    global _spaces_index
+    spaces, by_key = _spaces_index
+    if spaces is not atl.confluence_spaces:
+        spaces = atl.confluence_spaces
+        by_key = {}
+        for s in spaces:
+            by_key.setdefault(s.key.upper(), s)  # first match wins, as before
+        _spaces_index = (spaces, by_key)
+    space = by_key.get(space_key.upper())
+    if space is None:
+        raise HTTPException(status_code=404, detail=f"Space '{space_key}' not configured")
+    return space
 
 
 def _wiki_prefix(atl) -> str:
     return "/wiki" if atl.deployment_type == "cloud" else ""
 
 
-def _build_page_tree(pages_flat: list) -> list:
-    """Build a nested tree from a flat list of pages with parent_id."""
-    by_id = {p["id"]: p for p in pages_flat}
+# A slotted dataclass rather than a dict per page: large spaces list
+# thousands of them. Serializes to the same JSON object (children last)
+@dataclass(slots=True)
+class PageNode:
+    id: str
+    title: str
+    parent_id: str | None
+    version: int
+    children: list["PageNode"] = field(default_factory=list)
+
+
+def _build_page_tree(pages_flat: list[PageNode]) -> list[PageNode]:
+    """Build a nested tree from a flat list of pages with parent_id.
+
+    Pages are linked in place through their children lists.
+    """
+    by_id = {p.id: p for p in pages_flat}
     roots = []
     for page in pages_flat:
-        parent_id = page.get("parent_id")
-        if parent_id and parent_id in by_id:
-            by_id[parent_id]["children"].append(page)
-        else:
+        parent = by_id.get(page.parent_id)
+        if parent is None:
             roots.append(page)
+        else:
+            parent.children.append(page)
     return roots
 
 
 @router.get("/spaces")
 def list_spaces():
     _require_unlocked()
-    config = load_config_decrypted()
+    config = load_config_shared()
     return [
         {"key": s.key, "name": s.name}
         for s in config.atlassian.confluence_spaces
     ]
 
 
-def _fetch_pages_flat(atl, space_key: str) -> list:
-    """Fetch all pages in a space as a flat list."""
-    pages_flat = []
-    start = 0
+def _page_summaries(data: dict) -> list[PageNode]:
+    """Flat page entries from one page of a content listing."""
+    pages = []
+    for page in data.get("results", []):
+        ancestors = page.get("ancestors", [])
+        parent_id = ancestors[-1]["id"] if ancestors else None
+        pages.append(PageNode(
+            id=page["id"],
+            title=page.get("title", ""),
+            parent_id=parent_id,
+            version=page.get("version", {}).get("number", 1),
+        ))
+    return pages
+
+
+def _iter_page_batches(atl, space_key: str):
+    """Yield a space's pages as flat lists, one per listing response, so
+    callers can start on the first batch while the rest is fetched."""
     limit = 200  # Confluence Cloud caps at 200 regardless of requested limit
-    prefix = _wiki_prefix(atl)
+    # Everything but the offset is fixed, so format it once
+    base = (f"{_wiki_prefix(atl)}/rest/api/content"
+            f"?spaceKey={quote(space_key)}&type=page&expand=ancestors,version"
+            f"&limit={limit}&start=")
+
+    def listing(start: int) -> str:
+        return base + str(start)
+
+    data = atlassian_request(atl, listing(0))
+    yield _page_summaries(data)
+    if "next" not in data.get("_links", {}):
+        return
+
+    # When the listing reports totalSize, request the remaining offsets
+    # in parallel, stepping by the limit the server actually applied
+    total = data.get("totalSize")
+    step = data.get("limit") or data.get("size")
+    if isinstance(total, int) and step:
+        rest = atlassian_request_many(
+            atl, [listing(start) for start in range(step, total, step)])
+        for page_data in rest:
+            yield _page_summaries(page_data)
+        return
+
+    # Otherwise follow _links.next; comparing size < limit is unreliable
+    # because the server may silently cap the limit (Cloud caps at 200).
+    start = data.get("size", len(data.get("results", [])))
     while True:
-        data = atlassian_request(
-            atl,
-            f"{prefix}/rest/api/content"
-            f"?spaceKey={space_key}&type=page&expand=ancestors,version"
-            f"&start={start}&limit={limit}",
-        )
-        for page in data.get("results", []):
-            ancestors = page.get("ancestors", [])
-            parent_id = ancestors[-1]["id"] if ancestors else None
-            pages_flat.append({
-                "id": page["id"],
-                "title": page.get("title", ""),
-                "parent_id": parent_id,
-                "version": page.get("version", {}).get("number", 1),
-                "children": [],
-            })
-        # Use _links.next to determine if there are more pages;
-        # comparing size < limit is unreliable because the server
-        # may silently cap the limit (Cloud caps at 200).
+        data = atlassian_request(atl, listing(start))
+        yield _page_summaries(data)
         if "next" not in data.get("_links", {}):
             break
-        size = data.get("size", len(data.get("results", [])))
-        start += size
-    return pages_flat
+        start += data.get("size", len(data.get("results", [])))
+
+
+def _fetch_pages_flat(atl, space_key: str) -> list[PageNode]:
+    """Fetch all pages in a space as a flat list."""
+    return [page for batch in _iter_page_batches(atl, space_key)
+            for page in batch]
 
 
 def _fetch_single_page(atl, page_id: str) -> dict:
@@ -100,6 +215,24 @@ def _fetch_single_page(atl, page_id: str) -> dict:
         f"{prefix}/rest/api/content/{page_id}"
         f"?expand=body.storage,version,ancestors,space",
     )
+    return _page_content(data)
+
+
+def _fetch_pages_bulk(atl, page_ids: list[str]) -> list[dict]:
+    """Fetch up to _BULK_SIZE pages' content in one CQL search. Pages the
+    search does not return (deleted, restricted) are simply missing."""
+    prefix = _wiki_prefix(atl)
+    cql = quote(f"id in ({','.join(page_ids)})")
+    data = atlassian_request(
+        atl,
+        f"{prefix}/rest/api/content/search?cql={cql}"
+        f"&expand=body.storage,version,ancestors,space&limit={len(page_ids)}",
+    )
+    return [_page_content(page) for page in data.get("results", [])]
+
+
+def _page_content(data: dict) -> dict:
+    """The cached shape of a page from a content API response."""
     ancestors = data.get("ancestors", [])
     return {
         "id": data["id"],
@@ -116,15 +249,110 @@ def _fetch_single_page(atl, page_id: str) -> dict:
     }
 
 
+def _is_current(cached: dict | None, version: int, parent_id) -> bool:
+    """Whether a cached page matches the listing's version and parent (a
+    move can change the ancestors without a new version)."""
+    if not cached or cached.get("version") != version:
+        return False
+    ancestors = cached.get("ancestors") or []
+    return (ancestors[-1]["id"] if ancestors else None) == parent_id
+
+
+def _refresh_page_contents(atl, cache, space_key: str, pages,
+                           listed: dict | None = None,
+                           progress: Callable[[int, int], None] | None = None,
+                           ) -> tuple[int, int, list]:
+    """Fetch and cache each page's content, up to _BULK_SIZE pages per
+    request and several requests at a time, paced to _REFRESH_RATE
+    requests/s across all refreshes of the same host.
+
+    ``pages`` (any iterable; fetching starts as items arrive) are dicts
+    with at least "id"; a failed page yields the dict plus an "error"
+    message. ``listed`` maps page ids to (version, parent_id) from a space
+    listing: a cached page that still matches is kept, not re-downloaded.
+    ``progress(done, total)`` is called as each page finishes, with the
+    number of pages seen so far as total.
+    Returns (downloaded count, unchanged count, errors in ``pages`` order).
+    """
+    pacer = shared_pacer(atl, _REFRESH_RATE)
+    seen = done = 0
+    lock = threading.Lock()
+
+    def finished(count: int):
+        nonlocal done
+        if progress:
+            with lock:
+                done += count
+                progress(done, seen)
+
+    def store(page: dict, result: dict | None) -> dict | None:
+        """Cache a page's content, fetching it alone if ``result`` is None;
+        any failure, a cache write included, becomes the page's error."""
+        try:
+            if result is None:
+                pacer.wait()
+                result = _fetch_single_page(atl, page["id"])
+            cache.write(cache.confluence_page_path(space_key, page["id"]), result)
+        except Exception as e:
+            return {**page, "error": str(e)}
+        return None
+
+    def refresh(batch: list) -> list:
+        # Pages the search did not return (or all, if it failed) fall
+        # back to a single GET each, which reports their own error
+        found = {}
+        ids = [page["id"] for page in batch]
+        if len(ids) > 1 and all(pid.isdigit() for pid in ids):
+            pacer.wait()
+            try:
+                found = {p["id"]: p for p in _fetch_pages_bulk(atl, ids)}
+            except Exception:
+                found = {}
+        outcomes = []
+        for page in batch:
+            outcomes.append(store(page, found.get(page["id"])))
+            finished(1)
+        return outcomes
+
+    entries = []  # (page, its batch's future or None if kept, index in batch)
+    batch = []
+    unchanged = 0
+    with ThreadPoolExecutor(max_workers=_REFRESH_WORKERS) as pool:
+        for page in pages:
+            with lock:
+                seen += 1
+            path = cache.confluence_page_path(space_key, page["id"])
+            known = listed.get(page["id"]) if listed else None
+            if known and _is_current(cache.read_stale(path), *known):
+                cache.touch(path)
+                unchanged += 1
+                entries.append((page, None, 0))
+                finished(1)
+                continue
+            batch.append(page)
+            if len(batch) == _BULK_SIZE:
+                future = pool.submit(refresh, batch)
+                entries.extend((p, future, i) for i, p in enumerate(batch))
+                batch = []
+        if batch:
+            future = pool.submit(refresh, batch)
+            entries.extend((p, future, i) for i, p in enumerate(batch))
+    outcomes = [(page, future.result()[i] if future else None)
+                for page, future, i in entries]
+    errors = [o for _, o in outcomes if o is not None]
+    cache.index_confluence_pages(
+        [page["id"] for page, o in outcomes if o is None], space_key)
+    return len(outcomes) - len(errors) - unchanged, unchanged, errors
+
+
 @router.get("/spaces/{space_key}/pages")
 def get_pages(space_key: str, refresh: bool = False):
-    _require_unlocked()
     atl, cache = _get_cache()
     space = _find_space(atl, space_key)
 
     path = cache.confluence_pages_path(space.key)
     if not refresh:
-        cached = cache.read(path)
+        cached = _read_cached(cache, path)
         if cached:
             cached["from_cache"] = True
             return cached
@@ -134,60 +362,118 @@ def get_pages(space_key: str, refresh: bool = False):
 
     result = {"space_key": space.key, "pages": tree, "total": len(pages_flat)}
     cache.write(path, result)
+    cache.index_confluence_pages([p.id for p in pages_flat], space.key)
     result["from_cache"] = False
     return result
 
 
+def _read_cached_page(cache, spaces, page_id: str) -> dict | None:
+    """Read a page's cache file from every space at once; the first hit
+    in configured space order wins."""
+    paths = [cache.confluence_page_path(s.key, page_id) for s in spaces]
+    if len(paths) <= 1:
+        hits = [_read_cached(cache, p) for p in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_READS, len(paths))) as pool:
+            hits = list(pool.map(lambda p: _read_cached(cache, p), paths))
+    return next((h for h in hits if h), None)
+
+
 @router.get("/pages/{page_id}")
 def get_page(page_id: str, refresh: bool = False):
-    _require_unlocked()
     atl, cache = _get_cache()
 
-    # Check all configured space caches first
+    # The page index names the page's space; without an entry, check all
+    # configured space caches
     if not refresh:
-        for space in atl.confluence_spaces:
-            p = cache.confluence_page_path(space.key, page_id)
-            cached = cache.read(p)
-            if cached:
-                cached["from_cache"] = True
-                return cached
+        space_key = cache.confluence_page_space(page_id)
+        if space_key is not None:
+            cached = _read_cached(cache, cache.confluence_page_path(space_key, page_id))
+        else:
+            cached = _read_cached_page(cache, atl.confluence_spaces, page_id)
+        if cached:
+            cached["from_cache"] = True
+            return cached
 
     result = _fetch_single_page(atl, page_id)
     path = cache.confluence_page_path(result["space_key"], page_id)
     cache.write(path, result)
+    cache.index_confluence_pages([page_id], result["space_key"])
     result["from_cache"] = False
     return result
 
 
+def _progress_stream(run: Callable) -> StreamingResponse:
+    """Run a refresh in the background and stream it as NDJSON.
+
+    ``run(progress)`` returns the usual result body. The stream carries
+    {"event": "progress", "done", "total"} lines while it works, then one
+    {"event": "complete", ...result} or {"event": "error", "detail"} line.
+    """
+    events = queue.Queue()
+
+    def work():
+        try:
+            result = run(lambda done, total: events.put(
+                {"event": "progress", "done": done, "total": total}))
+        except HTTPException as e:
+            events.put({"event": "error", "detail": e.detail})
+        except Exception as e:
+            events.put({"event": "error", "detail": str(e)})
+        else:
+            events.put({"event": "complete", **result})
+        events.put(None)
+
+    def lines():
+        while (event := events.get()) is not None:
+            yield json.dumps(event) + "\n"
+
+    threading.Thread(target=work, daemon=True).start()
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/spaces/{space_key}/refresh")
-def refresh_space(space_key: str):
-    """Refresh the page tree and all page contents for a space, throttled to 5 req/s."""
-    _require_unlocked()
+def refresh_space(space_key: str, stream: bool = False):
+    """Refresh the page tree and all page contents for a space, paced to 5 req/s.
+
+    With ``stream``, progress is reported as NDJSON (see _progress_stream).
+    """
     atl, cache = _get_cache()
     space = _find_space(atl, space_key)
+    if stream:
+        return _progress_stream(lambda progress: _refresh_space(
+            atl, cache, space.key, progress))
+    return _refresh_space(atl, cache, space.key)
 
-    # 1. Refresh page tree
-    pages_flat = _fetch_pages_flat(atl, space.key)
-    tree = _build_page_tree([{**p, "children": []} for p in pages_flat])
-    tree_result = {"space_key": space.key, "pages": tree, "total": len(pages_flat)}
-    cache.write(cache.confluence_pages_path(space.key), tree_result)
 
-    # 2. Fetch each page content, throttled at 5 req/s (200ms between requests)
-    refreshed = 0
-    errors = []
-    for page in pages_flat:
-        try:
-            result = _fetch_single_page(atl, page["id"])
-            cache.write(cache.confluence_page_path(space.key, page["id"]), result)
-            refreshed += 1
-        except Exception as e:
-            errors.append({"id": page["id"], "title": page["title"], "error": str(e)})
-        time.sleep(0.2)
+def _refresh_space(atl, cache, space_key: str, progress=None) -> dict:
+    # 1. Fetch each page content, concurrently but paced at 5 req/s,
+    # starting on each listing batch while the next one is requested.
+    # Pages whose cached copy has the listed version are not downloaded.
+    pages_flat = []
+    versions = {}
+
+    def listed():
+        for batch in _iter_page_batches(atl, space_key):
+            pages_flat.extend(batch)
+            for p in batch:
+                versions[p.id] = (p.version, p.parent_id)
+                yield {"id": p.id, "title": p.title}
+
+    refreshed, unchanged, errors = _refresh_page_contents(
+        atl, cache, space_key, listed(), versions, progress)
+
+    # 2. Refresh page tree, complete once the listing is
+    tree = _build_page_tree(pages_flat)
+    tree_result = {"space_key": space_key, "pages": tree, "total": len(pages_flat)}
+    cache.write(cache.confluence_pages_path(space_key), tree_result)
+    cache.index_confluence_pages([p.id for p in pages_flat], space_key)
 
     return {
-        "space_key": space.key,
+        "space_key": space_key,
         "pages_total": len(pages_flat),
         "pages_refreshed": refreshed,
+        "pages_unchanged": unchanged,
         "errors": errors,
     }
 
@@ -197,26 +483,27 @@ class RefreshPagesRequest(BaseModel):
 
 
 @router.post("/spaces/{space_key}/refresh-pages")
-def refresh_pages(space_key: str, request: RefreshPagesRequest):
-    """Refresh specific pages by ID, throttled to 5 req/s."""
-    _require_unlocked()
+def refresh_pages(space_key: str, request: RefreshPagesRequest,
+                  stream: bool = False):
+    """Refresh specific pages by ID, paced to 5 req/s.
+
+    With ``stream``, progress is reported as NDJSON (see _progress_stream).
+    """
     atl, cache = _get_cache()
     space = _find_space(atl, space_key)
 
-    refreshed = 0
-    errors = []
-    for page_id in request.page_ids:
-        try:
-            result = _fetch_single_page(atl, page_id)
-            cache.write(cache.confluence_page_path(space.key, page_id), result)
-            refreshed += 1
-        except Exception as e:
-            errors.append({"id": page_id, "error": str(e)})
-        time.sleep(0.2)
-
-    return {
-        "space_key": space.key,
-        "pages_total": len(request.page_ids),
-        "pages_refreshed": refreshed,
-        "errors": errors,
-    }
+    def run(progress=None) -> dict:
+        refreshed, unchanged, errors = _refresh_page_contents(
+            atl, cache, space.key, [{"id": pid} for pid in request.page_ids],
+            progress=progress)
+        return {
+            "space_key": space.key,
+            "pages_total": len(request.page_ids),
+            "pages_refreshed": refreshed,
+            "pages_unchanged": unchanged,
+            "errors": errors,
+        }
+
+    if stream:
+        return _progress_stream(run)
+    return run()
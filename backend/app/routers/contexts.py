@@ -1145,18 +1145,26 @@ def _resolve_confluence_page(page_id: str) -> dict:
     cache = _get_cache()
     config = load_config_decrypted()
 
-    # Search across all configured spaces
-    for space in config.atlassian.confluence_spaces:
-        p = cache.confluence_page_path(space.key, page_id)
+    # The page index names the page's space; search all configured
+    # spaces only if it has no entry or the file is gone
+    space_keys = [s.key for s in config.atlassian.confluence_spaces]
+    known = cache.confluence_page_space(page_id)
+    if known in space_keys:
+        space_keys.remove(known)
+        space_keys.insert(0, known)
+    for space_key in space_keys:
+        p = cache.confluence_page_path(space_key, page_id)
         if p.exists():
             data = json.loads(p.read_text(encoding="utf-8"))
+            if space_key != known:
+                cache.index_confluence_pages([page_id], space_key)
             title = data.get("title", "Untitled")
             return {
                 "type": "confluence_page",
                 "id": page_id,
                 "title": title,
                 "label": title,
-                "space_key": data.get("space_key", space.key),
+                "space_key": data.get("space_key", space_key),
             }
 
     # Not in cache — fetch from Confluence API
@@ -1171,6 +1179,7 @@ def _resolve_confluence_page(page_id: str) -> dict:
     space_key = data.get("space_key", "unknown")
     path = cache.confluence_page_path(space_key, page_id)
     cache.write(path, data)
+    cache.index_confluence_pages([page_id], space_key)
 
     title = data.get("title", "Untitled")
     return {
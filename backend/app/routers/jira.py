@@ -6,7 +6,9 @@ from pydantic import BaseModel
 
 from app.config import load_config_decrypted, save_config, has_encrypted_fields
 from app.session import session
-from app.atlassian_client import atlassian_request, require_atlassian_configured
+from app.atlassian_client import (
+    atlassian_request, atlassian_request_many, require_atlassian_configured,
+)
 from app.jira_cache import JiraCache
 from app.jira_issue_service import JiraIssueService
 
@@ -309,8 +311,15 @@ def get_project_metadata(project_key: str, refresh: bool = False):
             cached["from_cache"] = True
             return cached
 
+    components_raw, versions_raw, statuses_raw, priorities_raw = \
+        atlassian_request_many(atl, [
+            f"/rest/api/2/project/{project.key}/components",
+            f"/rest/api/2/project/{project.key}/versions",
+            f"/rest/api/2/project/{project.key}/statuses",
+            "/rest/api/2/priority",
+        ])
+
     # Components
-    components_raw = atlassian_request(atl, f"/rest/api/2/project/{project.key}/components")
     components = [
         {
             "id": c.get("id", ""),
@@ -322,7 +331,6 @@ def get_project_metadata(project_key: str, refresh: bool = False):
     ]
 
     # Versions
-    versions_raw = atlassian_request(atl, f"/rest/api/2/project/{project.key}/versions")
     versions = [
         {
             "id": v.get("id", ""),
@@ -335,7 +343,6 @@ def get_project_metadata(project_key: str, refresh: bool = False):
     ]
 
     # Issue types + statuses
-    statuses_raw = atlassian_request(atl, f"/rest/api/2/project/{project.key}/statuses")
     issue_types = [
         {
             "id": entry.get("id", ""),
@@ -353,7 +360,6 @@ def get_project_metadata(project_key: str, refresh: bool = False):
     ]
 
     # Priorities (global)
-    priorities_raw = atlassian_request(atl, "/rest/api/2/priority")
     priorities = [
         {
             "id": p.get("id", ""),
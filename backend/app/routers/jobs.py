@@ -12,7 +12,9 @@ from app.models_jobs import (
     StartPipelineRequest, StartPipelineResponse,
     JobListResponse, JobSummary, JobDetailResponse, JobStatus,
 )
-from app.neo4j_client import get_neo4j_driver, run_cypher_write
+from app.neo4j_client import (
+    get_neo4j_driver, run_cypher_read, run_cypher_write,
+)
 from app.session import session
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
@@ -120,12 +122,13 @@ def _cleanup_repo(driver, repo_path: str, repo_name: str, job_id: str = ""):
         WHERE NOT EXISTS { MATCH (a)-[]-() }
         DELETE a
     """)
-    run_cypher_write(driver, """
+    from app.analyzers.java_maven import delete_module_subgraph
+    for row in run_cypher_read(driver, """
         MATCH (r:Java:Repository {path: $repo_path})
               -[:CONTAINS_MODULE]->(m:Java:Module)
-        OPTIONAL MATCH (m)-[*]->(n)
-        DETACH DELETE n, m
-    """, {"repo_path": repo_path})
+        RETURN m.name AS name
+    """, {"repo_path": repo_path}):
+        delete_module_subgraph(driver, row["name"])
     run_cypher_write(driver, """
         MATCH (r:Java:Repository {path: $repo_path})
         DETACH DELETE r
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from openai import OpenAI
 
+from app.analyzers.class_source import hydrate_class_sources
 from app.config import load_config_decrypted
 from app.cypher_validator import validate_read_only
 from app.models import ExpandRequest, QueryRequest, QueryResponse
@@ -58,7 +59,7 @@ Node labels and their properties:
 - Java:Repository: name, path
 - Java:Module: name, path, detected_technologies (list of strings)
 - Java:Package: full_name, name
-- Java:Class: full_name, name, kind (class|interface|enum|record), is_abstract, is_test, file_path, visibility, source_code (full Java file), annotations (JSON), imports (list of FQN strings), star_imports (list of package strings), supertypes (JSON)
+- Java:Class: full_name, name, kind (class|interface|enum|record), is_abstract, is_test, file_path, visibility, source_start, source_end (byte offsets of the class source within file_path), source_hash (digest of file_path at analysis time), annotations (JSON), imports (list of FQN strings), star_imports (list of package strings), supertypes (JSON)
 - Java:Method: full_name, name, return_type, parameters, is_static, is_abstract, visibility, start_line, end_line, annotations (JSON)
 
 Relationships:
@@ -388,6 +389,7 @@ def execute_query(request: QueryRequest):
 
     # Step 4: Enrich orphan methods with parent Class
     _enrich_orphan_methods(graph_data)
+    hydrate_class_sources(driver, graph_data["nodes"])
 
     return QueryResponse(
         cypher=cypher,
@@ -673,6 +675,7 @@ def expand_node(request: ExpandRequest):
         pass
 
     _enrich_orphan_methods(graph_data)
+    hydrate_class_sources(driver, graph_data["nodes"])
 
     return QueryResponse(
         cypher=cypher,
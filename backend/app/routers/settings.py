@@ -8,8 +8,11 @@ from pydantic import BaseModel
 from app.config import load_config_decrypted, save_config, has_encrypted_fields
 from app.models import AppConfig, JiraProjectConfig
 from app.session import session
-from app.atlassian_client import atlassian_request, require_atlassian_configured
+from app.atlassian_client import (
+    atlassian_request, atlassian_request_many, require_atlassian_configured,
+)
 from app.bitbucket_client import bitbucket_request, require_bitbucket_configured
+from app.neo4j_client import retire_stale_neo4j_driver
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -44,6 +47,7 @@ def update_settings(config: AppConfig):
     if errors:
         raise HTTPException(status_code=422, detail="; ".join(errors))
     save_config(config)
+    retire_stale_neo4j_driver()
     return load_config_decrypted()
 
 
@@ -239,13 +243,15 @@ def verify_projects(req: VerifyProjectsRequest):
     require_unlocked()
     atl = load_config_decrypted().atlassian
     require_atlassian_configured(atl)
+    responses = atlassian_request_many(
+        atl, [f"/rest/api/2/project/{key}" for key in req.keys],
+        return_exceptions=True)
     projects = []
-    for key in req.keys:
-        try:
-            data = atlassian_request(atl, f"/rest/api/2/project/{key}")
-            projects.append({"key": data["key"], "name": data["name"], "valid": True})
-        except HTTPException:
+    for key, data in zip(req.keys, responses):
+        if isinstance(data, HTTPException):
             projects.append({"key": key, "name": "", "valid": False})
+        else:
+            projects.append({"key": data["key"], "name": data["name"], "valid": True})
     return {"projects": projects}
 
 
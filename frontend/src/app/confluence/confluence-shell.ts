@@ -165,6 +165,7 @@ export class ConfluenceSpacesComponent implements OnInit {
       next: (result) => {
         this.refreshing.set(false);
         const msg = `Refreshed ${result.pages_refreshed}/${result.pages_total} pages` +
+          (result.pages_unchanged ? `, ${result.pages_unchanged} unchanged` : '') +
           (result.errors.length ? ` (${result.errors.length} errors)` : '');
         this.refreshMessage.set(msg);
         setTimeout(() => this.refreshMessage.set(''), 5000);
@@ -194,6 +195,7 @@ export class ConfluenceSpacesComponent implements OnInit {
       next: (result) => {
         this.refreshing.set(false);
         const msg = `Refreshed ${result.pages_refreshed}/${result.pages_total} pages` +
+          (result.pages_unchanged ? `, ${result.pages_unchanged} unchanged` : '') +
           (result.errors.length ? ` (${result.errors.length} errors)` : '');
         this.refreshMessage.set(msg);
         setTimeout(() => this.refreshMessage.set(''), 5000);
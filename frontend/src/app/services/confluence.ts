@@ -45,6 +45,7 @@ export interface RefreshSpaceResult {
   space_key: string;
   pages_total: number;
   pages_refreshed: number;
+  pages_unchanged: number;
   errors: { id: string; title: string; error: string }[];
 }
 